@@ -1,5 +1,7 @@
 import os
-from argparse import Namespace
+from string import Template
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
 from agent.constants import (
     CODE_ROOT,
@@ -13,10 +15,68 @@ from agent.prompting import build_repo_task_contract_prompt, build_task_contract
 from agent.toolchain import ToolchainBinaries, get_target_details
 from agent.workspace import collect_existing_code_context, get_prompt_run_dir, make_timestamped_run_dir
 
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+
+_INITIAL_PROMPT_PREAMBLE = (
+    "CRITICAL: If an incremental feature is requested and there is existing code that met requirements prior to this incremental feature request, try to change that existing code as little as possible while implementing this feature. If you would like to improve on something that existed, jot that down in a comments and allow the developer to decide. "
+    "CRITICAL: If you start off with non-empty code, first check if that meets requirements before attempting to modify. You might not have to run this through an iteration of write-build-run - the requirements might be so different from the existing code that it is obvious that it has to be rewritten."
+)
+
+
+class PromptTemplate(Template):
+    """
+    string.Template that keeps the prompt files' str.format-style `{name}`
+    placeholders. `{{` and `}}` are escaped braces, as in str.format; unknown
+    names are left untouched.
+    """
+
+    delimiter = "{"
+    pattern = r"""
+    (?P<escaped>\{\{|\}\}) |
+    \{(?P<named>[_a-z][_a-z0-9]*)\} |
+    (?P<braced>(?!)) |
+    (?P<invalid>(?!))
+    """
+
+    def safe_substitute(self, mapping=None, /, **kws) -> str:
+        # Template's own conversion turns every escape into the delimiter, so `}}`
+        # needs this override to come out as a single `}`.
+        values = {**mapping, **kws} if mapping is not None else kws
+
+        def convert(mo) -> str:
+            named = mo.group("named")
+            if named is not None:
+                return str(values[named]) if named in values else mo.group()
+            return mo.group("escaped")[0]
+
+        return self.pattern.sub(convert, self.template)
+
+
+_PROMPT_CACHE: dict[str, tuple[int, int, PromptTemplate]] = {}
+
+
+def _load_prompt_template(prompt_path: str) -> PromptTemplate:
+    """
+    Return the parsed prompt template, reusing the cached copy while mtime/size are unchanged.
+    The file is opened once and stat'd through its handle, so there is no
+    separate existence check to race against.
+    """
+    with open(prompt_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        key = os.path.abspath(prompt_path)
+        cached = _PROMPT_CACHE.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        template = PromptTemplate(f.read().decode("utf-8"))
+    _PROMPT_CACHE[key] = (st.st_mtime_ns, st.st_size, template)
+    return template
+
 
 def build_loop_config(
     *,
-    args: Namespace,
+    args: "Namespace | SimpleNamespace",
     toolchain_binaries: ToolchainBinaries,
 ) -> LoopConfig:
     incremental_mode = args.incremental
@@ -28,40 +88,44 @@ def build_loop_config(
     existing_code_context = "" if repo_mode else collect_existing_code_context(args.source)
 
     prompt_path = os.path.join(WORKSPACE, args.prompt)
-    if not os.path.exists(prompt_path):
-        raise FileNotFoundError(f"Error: Prompt file not found at {prompt_path}")
-
-    with open(prompt_path, "r") as f:
-        base_prompt_text = f.read()
+    try:
+        prompt_template = _load_prompt_template(prompt_path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Error: Prompt file not found at {prompt_path}") from e
 
     prompt_run_dir = get_prompt_run_dir(CODE_ROOT, prompt_path)
     run_dir = make_timestamped_run_dir(prompt_run_dir)
 
+    code_dir = run_dir
     if repo_mode:
-        repo_dir = os.path.abspath(args.repo)
-        if not os.path.isdir(repo_dir):
-            raise FileNotFoundError(f"Error: Repo directory not found at {repo_dir}")
+        # normpath keeps abspath's normalization without its getcwd() call for absolute paths.
+        repo_dir = os.path.normpath(args.repo) if os.path.isabs(args.repo) else os.path.abspath(args.repo)
+        try:
+            with os.scandir(repo_dir) as it:
+                repo_entries = {entry.name for entry in it}
+        except OSError as e:
+            # Missing, not a directory, or unreadable: report it like a missing repo.
+            raise FileNotFoundError(f"Error: Repo directory not found at {repo_dir}") from e
         edit_dir = repo_dir
-        code_dir = run_dir
         entry_file_rel = os.path.normpath(args.entry_file)
         if entry_file_rel.startswith("..") or os.path.isabs(entry_file_rel):
             raise ValueError("Error: --entry-file must be a relative path inside --repo")
-        source_file = os.path.join(edit_dir, entry_file_rel)
-        history_file = os.path.join(code_dir, "run_history.json")
+        entry_top = entry_file_rel.split(os.sep, 1)[0]
+        if entry_top not in repo_entries:
+            print(f"[Info] '{entry_top}' does not exist in the repo root yet; the entry file will be created.")
     else:
         edit_dir = run_dir
-        code_dir = run_dir
         entry_file_rel = GENERATED_SOURCE_NAME
-        source_file = os.path.join(code_dir, GENERATED_SOURCE_NAME)
-        history_file = os.path.join(code_dir, "run_history.json")
 
+    source_file = os.path.join(edit_dir, entry_file_rel)
+    history_file = os.path.join(code_dir, "run_history.json")
     elf_file = os.path.join(code_dir, GENERATED_ELF_NAME)
 
     print(f"[Info] Run artifacts will be written to {code_dir}")
     if repo_mode:
         print(f"[Info] Repo edits will be applied in {edit_dir}")
 
-    formatted_prompt = base_prompt_text.format(
+    formatted_prompt = prompt_template.safe_substitute(
         uart_addr=uart_addr,
         board_name=board_name,
         expected_output=args.expected,
@@ -85,11 +149,7 @@ def build_loop_config(
             formatted_prompt=formatted_prompt,
         )
 
-    initial_prompt = (
-        "CRITICAL: If an incremental feature is requested and there is existing code that met requirements prior to this incremental feature request, try to change that existing code as little as possible while implementing this feature. If you would like to improve on something that existed, jot that down in a comments and allow the developer to decide. "
-        "CRITICAL: If you start off with non-empty code, first check if that meets requirements before attempting to modify. You might not have to run this through an iteration of write-build-run - the requirements might be so different from the existing code that it is obvious that it has to be rewritten."
-        f"{existing_code_context}"
-    )
+    initial_prompt = _INITIAL_PROMPT_PREAMBLE + existing_code_context
 
     return LoopConfig(
         toolchain=args.toolchain,
@@ -101,6 +161,7 @@ def build_loop_config(
         build_cmd=args.build_cmd,
         test_cmd=args.test_cmd,
         verify_timeout_sec=args.verify_timeout,
+        parallel_verify=args.parallel_verify,
         expected_output=args.expected,
         board_name=board_name,
         edit_dir=edit_dir,
@@ -114,4 +175,6 @@ def build_loop_config(
         workspace=WORKSPACE,
         toolchain_binaries=toolchain_binaries,
         max_retries=MAX_RETRIES,
+        # Shared by every run of this prompt so responses can be reused across runs.
+        llm_cache_file=os.path.join(prompt_run_dir, "llm_cache.json") if args.llm_cache else None,
     )
@@ -1,9 +1,68 @@
-import argparse
 import subprocess
 import sys
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    import argparse
+
+
+ARG_DEFAULTS = {
+    "yes": False,
+    "toolchain": "gcc",
+    "source": None,
+    "repo": None,
+    "entry_file": "agent_code.s",
+    "build_cmd": None,
+    "test_cmd": None,
+    "verify_timeout": 120,
+    "parallel_verify": False,
+    "prompt": "prompts/prime_sum.txt",
+    "expected": "SUM: 129",
+    "incremental": None,
+    "llm_cache": False,
+}
+TOOLCHAIN_CHOICES = ("gcc", "ds5")
+_FAST_PATH_VALUE_FLAGS = {
+    "--toolchain": "toolchain",
+    "--source": "source",
+    "--prompt": "prompt",
+    "--expected": "expected",
+}
+
+
+def _parse_args_fast(argv: list[str]) -> SimpleNamespace | None:
+    """
+    Parse the common short invocations (-y, --toolchain, --prompt, ...) without
+    argparse. Returns None for anything else so the full parser can handle it.
+    """
+    if len(argv) > 3:
+        return None
+    values = dict(ARG_DEFAULTS)
+    i = 0
+    while i < len(argv):
+        token = argv[i]
+        if token in ("-y", "--yes"):
+            values["yes"] = True
+            i += 1
+            continue
+        key = _FAST_PATH_VALUE_FLAGS.get(token)
+        if key is None or i + 1 >= len(argv) or argv[i + 1].startswith("-"):
+            return None
+        values[key] = argv[i + 1]
+        i += 2
+    if values["toolchain"] not in TOOLCHAIN_CHOICES:
+        return None
+    return SimpleNamespace(**values)
+
+
+def parse_args() -> "argparse.Namespace | SimpleNamespace":
+    fast_args = _parse_args_fast(sys.argv[1:])
+    if fast_args is not None:
+        return fast_args
+
+    import argparse
 
-def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Agentic ARM Development Loop")
     parser.add_argument(
         "-y",
@@ -13,69 +72,81 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--toolchain",
-        choices=["gcc", "ds5"],
-        default="gcc",
+        choices=TOOLCHAIN_CHOICES,
+        default=ARG_DEFAULTS["toolchain"],
         help="Toolchain to use (gcc or ds5)",
     )
     parser.add_argument(
         "--source",
         type=str,
         help="Path to an existing folder of code to start with.",
-        default=None,
+        default=ARG_DEFAULTS["source"],
     )
     parser.add_argument(
         "--repo",
         type=str,
         help="Path to a repository to edit/verify in repo mode.",
-        default=None,
+        default=ARG_DEFAULTS["repo"],
     )
     parser.add_argument(
         "--entry-file",
         type=str,
         help="Primary editable file path (relative to output/repo dir).",
-        default="agent_code.s",
+        default=ARG_DEFAULTS["entry_file"],
     )
     parser.add_argument(
         "--build-cmd",
         type=str,
         help="Build command for repo mode (required when --repo is set).",
-        default=None,
+        default=ARG_DEFAULTS["build_cmd"],
     )
     parser.add_argument(
         "--test-cmd",
         type=str,
         help="Optional test command for repo mode.",
-        default=None,
+        default=ARG_DEFAULTS["test_cmd"],
     )
     parser.add_argument(
         "--verify-timeout",
         type=int,
         help="Timeout in seconds for each repo-mode verify command.",
-        default=120,
+        default=ARG_DEFAULTS["verify_timeout"],
+    )
+    parser.add_argument(
+        "--parallel-verify",
+        action="store_true",
+        default=ARG_DEFAULTS["parallel_verify"],
+        help="Run the repo-mode test command concurrently with the build command.",
     )
     parser.add_argument(
         "--prompt",
         type=str,
         help="Path to a custom prompt file in the prompts/ folder.",
-        default="prompts/prime_sum.txt",
+        default=ARG_DEFAULTS["prompt"],
     )
     parser.add_argument(
         "--expected",
         type=str,
         help="Expected output string from the simulator.",
-        default="SUM: 129",
+        default=ARG_DEFAULTS["expected"],
     )
     parser.add_argument(
         "--incremental",
         nargs="?",
         const="normal",
         choices=["normal", "strict"],
-        default=None,
+        default=ARG_DEFAULTS["incremental"],
         help=(
             "Use incremental JSON edit retries instead of full-source retries. "
             "Optional mode: 'strict' prevents fallback to full-source after edit-apply failures."
         ),
     )
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        default=ARG_DEFAULTS["llm_cache"],
+        help="Reuse LLM responses from earlier runs of the same prompt when the request is identical.",
+    )
     args = parser.parse_args()
     if args.repo and not args.build_cmd:
         parser.error("--build-cmd is required when --repo is set")
@@ -84,20 +155,40 @@ def parse_args() -> argparse.Namespace:
     return args
 
 
+def _porcelain_z_lines(output: bytes) -> list[bytes]:
+    """
+    Split `git status --porcelain -z` output into the lines plain --porcelain
+    prints. With -z a rename or copy is followed by a separate field holding
+    its original path, which is folded back into `XY ORIG -> PATH`.
+    """
+    lines: list[bytes] = []
+    fields = iter(output.split(b"\0"))
+    for field in fields:
+        if not field:
+            continue
+        if b"R" in field[:2] or b"C" in field[:2]:
+            lines.append(field[:3] + next(fields, b"") + b" -> " + field[3:])
+        else:
+            lines.append(field)
+    return lines
+
+
 def check_git_status(auto_yes: bool = False) -> None:
     """
     Check if there are uncommitted changes. If so, ask the user if they want to proceed.
     """
     try:
         result = subprocess.run(
-            ["git", "status", "--porcelain"],
+            ["git", "status", "--porcelain", "-z"],
             capture_output=True,
-            text=True,
             check=True,
         )
-        if result.stdout.strip():
+        status_lines = _porcelain_z_lines(result.stdout)
+        if status_lines:
             print("\n[Warning] You have uncommitted changes in your repository:")
-            print(result.stdout)
+            sys.stdout.flush()
+            sys.stdout.buffer.write(b"\n".join(status_lines) + b"\n")
+            sys.stdout.buffer.flush()
             if auto_yes:
                 print("[Info] Proceeding because --yes/-y was provided.")
                 return
@@ -1,5 +1,13 @@
 import json
 import os
+import stat
+from functools import lru_cache
+from typing import Callable
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise.
+    orjson = None
 
 
 TEXT_EDIT_OPS = {
@@ -11,7 +19,15 @@ TEXT_EDIT_OPS = {
     "prepend_text",
     "replace_entire_file",
 }
+FILE_EDIT_OPS = {
+    "create_file",
+    "delete_file",
+    "move_file",
+}
+SUPPORTED_EDIT_OPS = frozenset(TEXT_EDIT_OPS | FILE_EDIT_OPS)
+_SNIPPET_EDIT_OPS = frozenset({"replace_snippet", "delete_snippet", "insert_before", "insert_after"})
 MISSING = object()
+_JSON_DECODER = json.JSONDecoder()
 
 
 def parse_edit_instructions(response_text: str) -> tuple[list[dict], bool]:
@@ -22,20 +38,50 @@ def parse_edit_instructions(response_text: str) -> tuple[list[dict], bool]:
     - list of edit operation dictionaries
     - bool indicating whether non-JSON text had to be stripped first
     """
-    stripped = response_text.strip()
+    # Retries (and cached LLM responses) often repeat a response verbatim; the
+    # cached list and its edit dicts are copied so callers cannot change what
+    # later calls return.
+    edits, sanitized = _parse_edit_instructions_cached(response_text)
+    return [dict(edit) for edit in edits], sanitized
+
+
+@lru_cache(maxsize=32)
+def _parse_edit_instructions_cached(response_text: str) -> tuple[list[dict], bool]:
+    if response_text and not response_text[0].isspace() and not response_text[-1].isspace():
+        stripped = response_text
+    else:
+        stripped = response_text.strip()
     sanitized = False
 
-    try:
-        payload = json.loads(stripped)
-    except json.JSONDecodeError:
-        json_blob = _extract_first_json_object(stripped)
-        if json_blob is None:
+    payload = None
+    # Only a response that looks like a bare object is worth a whole-document parse.
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            if orjson is not None:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+                payload = orjson.loads(stripped)
+            else:
+                # raw_decode also accepts an object followed by trailing text, so
+                # that case does not need a second parse of the same prefix.
+                payload, end = _JSON_DECODER.raw_decode(stripped)
+                if not isinstance(payload, dict):
+                    payload = None
+                elif end != len(stripped):
+                    sanitized = True
+        except json.JSONDecodeError:
+            pass
+
+    if payload is None:
+        extracted = _extract_first_json_object(stripped)
+        if extracted is None:
             raise ValueError("Response is not valid JSON edit instructions")
+        json_blob, payload = extracted
         sanitized = json_blob != stripped
-        try:
-            payload = json.loads(json_blob)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON edit instructions: {e}") from e
+        if payload is None:
+            try:
+                payload = json.loads(json_blob)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON edit instructions: {e}") from e
 
     if not isinstance(payload, dict):
         raise ValueError("JSON edit instructions must be an object")
@@ -44,12 +90,24 @@ def parse_edit_instructions(response_text: str) -> tuple[list[dict], bool]:
     if not isinstance(edits, list) or not edits:
         raise ValueError("JSON edit instructions must include a non-empty 'edits' list")
 
-    for idx, edit in enumerate(edits, start=1):
+    invalid = next(
+        (
+            (idx, edit)
+            for idx, edit in enumerate(edits, start=1)
+            if not isinstance(edit, dict)
+            or not isinstance(edit.get("op"), str)
+            or edit["op"] not in SUPPORTED_EDIT_OPS
+        ),
+        None,
+    )
+    if invalid is not None:
+        idx, edit = invalid
         if not isinstance(edit, dict):
             raise ValueError(f"Edit #{idx} is not an object")
         op = edit.get("op")
         if not isinstance(op, str) or not op:
             raise ValueError(f"Edit #{idx} is missing required string field 'op'")
+        raise ValueError(f"Edit #{idx}: unsupported operation '{op}'")
 
     return edits, sanitized
 
@@ -67,11 +125,46 @@ def apply_edit_instructions(original_text: str, edits: list[dict]) -> str:
     - prepend_text: {"op":"prepend_text","text":"..."}
     - replace_entire_file: {"op":"replace_entire_file","content":"..."}
     """
-    updated = original_text
+    # append/prepend edits are buffered as chunks and only joined into the body
+    # when a later edit needs to search the full text.
+    head: list[str] = []
+    body = original_text
+    tail: list[str] = []
+    run: list[tuple[int, dict]] = []
     for idx, edit in enumerate(edits, start=1):
-        updated = _apply_text_edit(updated, edit, idx)
+        op = edit["op"]
+        if op in _SNIPPET_EDIT_OPS:
+            if not run and (head or tail):
+                body = "".join([*reversed(head), body, *tail])
+                head.clear()
+                tail.clear()
+            run.append((idx, edit))
+            continue
+        if run:
+            body = _apply_text_edit_run(body, run)
+            run.clear()
+        if op == "append_text":
+            tail.append(_required_string(edit, "text", idx))
+            continue
+        if op == "prepend_text":
+            head.append(_required_string(edit, "text", idx))
+            continue
+        if op == "replace_entire_file":
+            body = _required_string(edit, "content", idx)
+            head.clear()
+            tail.clear()
+            continue
+        if head or tail:
+            body = "".join([*reversed(head), body, *tail])
+            head.clear()
+            tail.clear()
+        body = _apply_text_edit(body, edit, idx)
 
-    return updated
+    if run:
+        body = _apply_text_edit_run(body, run)
+    if head or tail:
+        return "".join([*reversed(head), body, *tail])
+    return body
 
 
 def apply_workspace_edit_instructions(
@@ -79,6 +172,7 @@ def apply_workspace_edit_instructions(
     edits: list[dict],
     *,
     default_path: str | None = None,
+    file_contents: dict[str, str] | None = None,
 ) -> list[str]:
     """
     Apply path-aware edit operations to files under workspace_dir atomically.
@@ -92,6 +186,8 @@ def apply_workspace_edit_instructions(
     additionally include "path". If omitted, default_path is used.
 
     Returns a sorted list of relative paths changed by the operation set.
+    If file_contents is given, it is filled with the resulting text of every
+    existing file the edits read or wrote, keyed by normalized relative path.
     Raises ValueError on validation or apply failures and does not write any
     changes to disk in that case.
     """
@@ -106,27 +202,69 @@ def apply_workspace_edit_instructions(
     )
 
     file_cache: dict[str, str | object] = {}
+    abs_paths: dict[str, str] = {}
     dirty_paths: set[str] = set()
 
     def load_file(rel_path: str, idx: int) -> str | object:
         if rel_path in file_cache:
             return file_cache[rel_path]
         abs_path = _absolute_workspace_path(workspace_abs, rel_path, idx=idx, field="path")
-        if os.path.isdir(abs_path):
-            raise ValueError(f"Edit #{idx}: path points to a directory, not a file: {rel_path}")
-        if os.path.exists(abs_path):
-            try:
-                with open(abs_path, "r") as f:
-                    file_cache[rel_path] = f.read()
-            except OSError as e:
-                raise ValueError(f"Edit #{idx}: failed to read '{rel_path}': {e}") from e
-        else:
+        abs_paths[rel_path] = abs_path
+        try:
+            st = os.stat(abs_path)
+        except FileNotFoundError:
             file_cache[rel_path] = MISSING
-        return file_cache[rel_path]
+            return MISSING
+        except OSError as e:
+            raise ValueError(f"Edit #{idx}: failed to read '{rel_path}': {e}") from e
+        if stat.S_ISDIR(st.st_mode):
+            raise ValueError(f"Edit #{idx}: path points to a directory, not a file: {rel_path}")
+        try:
+            with open(abs_path, "rb") as f:
+                text = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            raise ValueError(f"Edit #{idx}: failed to read '{rel_path}': {e}") from e
+        if "\r" in text:
+            # Keep the universal-newline view that text-mode reads used to give.
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        file_cache[rel_path] = text
+        return text
+
+    # Consecutive snippet edits on one file are collected and applied together.
+    run_rel: str | None = None
+    run: list[tuple[int, dict]] = []
+
+    def flush_run() -> None:
+        nonlocal run_rel
+        if run_rel is not None:
+            file_cache[run_rel] = _apply_text_edit_run(file_cache[run_rel], run)
+            run_rel = None
+            run.clear()
 
     for idx, edit in enumerate(edits, start=1):
         op = edit["op"]
 
+        if op in _SNIPPET_EDIT_OPS and run_rel is not None:
+            try:
+                target_rel = _resolve_target_path(edit, idx=idx, default_rel=default_rel)
+            except ValueError:
+                flush_run()
+                raise
+            if target_rel == run_rel:
+                run.append((idx, edit))
+                continue
+        flush_run()
+
+        if op in _SNIPPET_EDIT_OPS:
+            target_rel = _resolve_target_path(edit, idx=idx, default_rel=default_rel)
+            current_value = load_file(target_rel, idx)
+            if current_value is MISSING:
+                raise ValueError(f"Edit #{idx}: target file not found: {target_rel}")
+            run_rel = target_rel
+            run.append((idx, edit))
+            dirty_paths.add(target_rel)
+            continue
+
         if op in TEXT_EDIT_OPS:
             target_rel = _resolve_target_path(edit, idx=idx, default_rel=default_rel)
             current_value = load_file(target_rel, idx)
@@ -176,62 +314,117 @@ def apply_workspace_edit_instructions(
 
         raise ValueError(f"Edit #{idx}: unsupported operation '{op}'")
 
-    for rel_path in sorted(dirty_paths):
-        abs_path = _absolute_workspace_path(workspace_abs, rel_path, idx=0, field="path")
+    flush_run()
+    changed_paths = sorted(dirty_paths)
+    deletes: list[tuple[str, str]] = []
+    writes: list[tuple[str, str, str]] = []
+    for rel_path in changed_paths:
+        abs_path = abs_paths.get(rel_path) or _absolute_workspace_path(
+            workspace_abs, rel_path, idx=0, field="path"
+        )
         value = file_cache[rel_path]
         if value is MISSING:
-            if os.path.exists(abs_path):
-                try:
-                    os.remove(abs_path)
-                except OSError as e:
-                    raise ValueError(f"Failed to delete '{rel_path}': {e}") from e
-            continue
+            deletes.append((rel_path, abs_path))
+        else:
+            assert isinstance(value, str)
+            writes.append((rel_path, abs_path, value))
 
-        assert isinstance(value, str)
-        parent = os.path.dirname(abs_path)
+    # Deletes go first so a removed file can be replaced by a directory of the same name.
+    for rel_path, abs_path in deletes:
+        try:
+            os.remove(abs_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            raise ValueError(f"Failed to delete '{rel_path}': {e}") from e
+
+    for parent in {os.path.dirname(abs_path) for _, abs_path, _ in writes}:
         if parent:
             os.makedirs(parent, exist_ok=True)
-        if os.path.isdir(abs_path):
-            raise ValueError(f"Cannot write file because a directory exists at '{rel_path}'")
+
+    for rel_path, abs_path, value in writes:
         try:
-            with open(abs_path, "w") as f:
-                f.write(value)
+            _write_file(abs_path, value.encode())
+        except IsADirectoryError as e:
+            raise ValueError(f"Cannot write file because a directory exists at '{rel_path}'") from e
         except OSError as e:
             raise ValueError(f"Failed to write '{rel_path}': {e}") from e
 
-    return sorted(dirty_paths)
+    if file_contents is not None:
+        for rel_path, value in file_cache.items():
+            if value is not MISSING:
+                file_contents[rel_path] = value
+    return changed_paths
+
+
+def _write_file(abs_path: str, data: bytes) -> None:
+    fd = os.open(abs_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
-def _extract_first_json_object(text: str) -> str | None:
+def _extract_first_json_object(text: str) -> tuple[str, dict | None] | None:
+    """
+    Locate the first JSON object in text and return (json_blob, decoded_object).
+    decoded_object is None when only a brace-balanced, non-decodable block was found.
+    """
+    # Fast path: let the C JSON decoder validate from the first '{'.
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        obj, end = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        # Slow path, run at most once: the first brace-balanced block is the
+        # malformed payload, returned so the caller reports its decode error.
+        # None means the braces never balance (e.g. a truncated response).
+        json_blob = _scan_balanced_braces(text[start:])
+        if json_blob is None:
+            return None
+        return json_blob, None
+    return text[start:end], obj
+
+
+_QUOTE, _BACKSLASH, _OPEN_BRACE, _CLOSE_BRACE = b'"\\{}'
+
+
+def _scan_balanced_braces(text: str) -> str | None:
+    # Scan UTF-8 bytes so each step compares small ints instead of creating
+    # one-character strings; multi-byte sequences never contain ASCII bytes.
+    data = text.encode("utf-8", "surrogatepass")
     in_string = False
     escaped = False
     depth = 0
     start_idx = -1
 
-    for i, ch in enumerate(text):
+    for i, ch in enumerate(memoryview(data)):
         if in_string:
             if escaped:
                 escaped = False
-            elif ch == "\\":
+            elif ch == _BACKSLASH:
                 escaped = True
-            elif ch == '"':
+            elif ch == _QUOTE:
                 in_string = False
             continue
 
-        if ch == '"':
+        if ch == _QUOTE:
             in_string = True
             continue
-        if ch == "{":
+        if ch == _OPEN_BRACE:
             if depth == 0:
                 start_idx = i
             depth += 1
             continue
-        if ch == "}":
+        if ch == _CLOSE_BRACE:
             if depth == 0:
                 continue
             depth -= 1
             if depth == 0 and start_idx >= 0:
-                return text[start_idx:i + 1]
+                return data[start_idx:i + 1].decode("utf-8", "surrogatepass")
 
     return None
 
@@ -261,20 +454,34 @@ def _occurrence(edit: dict, idx: int) -> int | None:
 
 def _normalize_relative_path(path: str, *, idx: int, field: str) -> str:
     raw = path.strip()
-    if not raw:
+    normalized, problem = _normalize_stripped_path(raw)
+    if problem is None:
+        return normalized
+    if problem == "empty":
         raise ValueError(f"Edit #{idx}: field '{field}' cannot be empty")
+    if problem == "absolute":
+        raise ValueError(f"Edit #{idx}: field '{field}' must be a relative path: {raw}")
+    raise ValueError(f"Edit #{idx}: field '{field}' escapes workspace: {raw}")
 
+
+@lru_cache(maxsize=4096)
+def _normalize_stripped_path(raw: str) -> tuple[str, str | None]:
+    # Edits in a batch usually repeat the same few paths; the error message
+    # depends on idx/field, so only the outcome is cached here.
+    if not raw:
+        return raw, "empty"
     normalized = os.path.normpath(raw)
     if os.path.isabs(normalized):
-        raise ValueError(f"Edit #{idx}: field '{field}' must be a relative path: {raw}")
+        return normalized, "absolute"
     if normalized in (".", "..") or normalized.startswith(f"..{os.sep}"):
-        raise ValueError(f"Edit #{idx}: field '{field}' escapes workspace: {raw}")
-    return normalized
+        return normalized, "escapes"
+    return normalized, None
 
 
 def _absolute_workspace_path(workspace_abs: str, rel_path: str, *, idx: int, field: str) -> str:
     abs_path = os.path.abspath(os.path.join(workspace_abs, rel_path))
-    if os.path.commonpath([workspace_abs, abs_path]) != workspace_abs:
+    prefix = workspace_abs if workspace_abs.endswith(os.sep) else workspace_abs + os.sep
+    if abs_path != workspace_abs and not abs_path.startswith(prefix):
         raise ValueError(f"Edit #{idx}: field '{field}' escapes workspace: {rel_path}")
     return abs_path
 
@@ -296,70 +503,156 @@ def _find_occurrence(haystack: str, needle: str, occurrence: int | None, idx: in
     if not needle:
         raise ValueError(f"Edit #{idx}: field '{field}' cannot be empty")
 
-    positions: list[int] = []
-    start = 0
-    while True:
-        pos = haystack.find(needle, start)
-        if pos < 0:
-            break
-        positions.append(pos)
-        start = pos + 1
-
-    if not positions:
+    first = haystack.find(needle)
+    if first < 0:
         raise ValueError(f"Edit #{idx}: '{field}' snippet not found in current source")
 
     if occurrence is None:
-        if len(positions) > 1:
+        if haystack.find(needle, first + 1) >= 0:
             raise ValueError(
-                f"Edit #{idx}: '{field}' snippet matched {len(positions)} locations; set 'occurrence' to disambiguate"
+                f"Edit #{idx}: '{field}' snippet matched {_count_overlapping(haystack, needle)} locations; "
+                "set 'occurrence' to disambiguate"
             )
-        return positions[0]
+        return first
 
-    if occurrence > len(positions):
-        raise ValueError(
-            f"Edit #{idx}: occurrence {occurrence} out of range for '{field}' snippet "
-            f"(found {len(positions)} matches)"
-        )
-    return positions[occurrence - 1]
+    pos = first
+    for _ in range(occurrence - 1):
+        pos = haystack.find(needle, pos + 1)
+        if pos < 0:
+            raise ValueError(
+                f"Edit #{idx}: occurrence {occurrence} out of range for '{field}' snippet "
+                f"(found {_count_overlapping(haystack, needle)} matches)"
+            )
+    return pos
+
+
+def _count_overlapping(haystack: str, needle: str) -> int:
+    # Only used to report match counts; str.count would skip overlapping matches.
+    count = 0
+    pos = haystack.find(needle)
+    while pos >= 0:
+        count += 1
+        pos = haystack.find(needle, pos + 1)
+    return count
+
+
+def _apply_text_edit_run(text: str, run: list[tuple[int, dict]]) -> str:
+    if len(run) > 1:
+        merged = _merge_snippet_edits(text, run)
+        if merged is not None:
+            return merged
+    for idx, edit in run:
+        text = _apply_text_edit(text, edit, idx)
+    return text
+
+
+def _merge_snippet_edits(text: str, run: list[tuple[int, dict]]) -> str | None:
+    """
+    Apply snippet edits in one left-to-right pass over text when doing so gives
+    the same result as applying them one after another. Returns None when it
+    might not (or when an edit is invalid) so the caller applies them in order.
+    """
+    splices: list[tuple[int, int, str, str]] = []
+    for _, edit in run:
+        op = edit["op"]
+        if edit.get("occurrence") is not None:
+            return None
+        needle = edit.get("old" if op in ("replace_snippet", "delete_snippet") else "anchor")
+        if not isinstance(needle, str) or not needle:
+            return None
+        if op == "delete_snippet":
+            new = ""
+        else:
+            value = edit.get("new" if op == "replace_snippet" else "text")
+            if not isinstance(value, str):
+                return None
+            if op == "insert_before":
+                new = value + needle
+            elif op == "insert_after":
+                new = needle + value
+            else:
+                new = value
+        start = text.find(needle)
+        if start < 0 or text.find(needle, start + 1) >= 0:
+            return None
+        splices.append((start, start + len(needle), new, needle))
+
+    # Keep matches far enough apart that no snippet can span two of them, then
+    # make sure no later snippet would match inside an earlier edit's result.
+    reach = max(len(needle) for _, _, _, needle in splices) - 1
+    ordered = sorted(splices)
+    for (_, prev_end, _, _), (start, _, _, _) in zip(ordered, ordered[1:]):
+        if start < prev_end + reach:
+            return None
+    for k in range(1, len(splices)):
+        needle = splices[k][3]
+        for start, end, new, _ in splices[:k]:
+            window = text[max(0, start - len(needle) + 1):start] + new + text[end:end + len(needle) - 1]
+            if needle in window:
+                return None
+
+    parts: list[str] = []
+    cursor = 0
+    for start, end, new, _ in ordered:
+        parts.append(text[cursor:start])
+        parts.append(new)
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts)
 
 
 def _apply_text_edit(text: str, edit: dict, idx: int) -> str:
     op = edit["op"]
-    try:
-        if op == "replace_snippet":
-            old = _required_string(edit, "old", idx)
-            new = _required_string(edit, "new", idx)
-            occurrence = _occurrence(edit, idx)
-            return _replace_once(text, old, new, occurrence, idx)
-        if op == "delete_snippet":
-            old = _required_string(edit, "old", idx)
-            occurrence = _occurrence(edit, idx)
-            return _replace_once(text, old, "", occurrence, idx)
-        if op == "insert_before":
-            anchor = _required_string(edit, "anchor", idx)
-            insert_text = _required_string(edit, "text", idx)
-            occurrence = _occurrence(edit, idx)
-            return _insert_relative(text, anchor, insert_text, before=True, occurrence=occurrence, idx=idx)
-        if op == "insert_after":
-            anchor = _required_string(edit, "anchor", idx)
-            insert_text = _required_string(edit, "text", idx)
-            occurrence = _occurrence(edit, idx)
-            return _insert_relative(text, anchor, insert_text, before=False, occurrence=occurrence, idx=idx)
-        if op == "append_text":
-            append_text = _required_string(edit, "text", idx)
-            return text + append_text
-        if op == "prepend_text":
-            prepend_text = _required_string(edit, "text", idx)
-            return prepend_text + text
-        if op == "replace_entire_file":
-            return _required_string(edit, "content", idx)
+    handler = _TEXT_EDIT_HANDLERS.get(op)
+    if handler is None:
         raise ValueError(f"Edit #{idx}: unsupported operation '{op}'")
-    except ValueError as e:
-        raise ValueError(str(e)) from e
+    return handler(text, edit, idx)
+
+
+def _op_replace_snippet(text: str, edit: dict, idx: int) -> str:
+    old = _required_string(edit, "old", idx)
+    new = _required_string(edit, "new", idx)
+    occurrence = _occurrence(edit, idx)
+    return _replace_once(text, old, new, occurrence, idx)
+
+
+def _op_delete_snippet(text: str, edit: dict, idx: int) -> str:
+    old = _required_string(edit, "old", idx)
+    occurrence = _occurrence(edit, idx)
+    return _replace_once(text, old, "", occurrence, idx)
+
+
+def _op_insert_before(text: str, edit: dict, idx: int) -> str:
+    anchor = _required_string(edit, "anchor", idx)
+    insert_text = _required_string(edit, "text", idx)
+    occurrence = _occurrence(edit, idx)
+    return _insert_relative(text, anchor, insert_text, before=True, occurrence=occurrence, idx=idx)
+
+
+def _op_insert_after(text: str, edit: dict, idx: int) -> str:
+    anchor = _required_string(edit, "anchor", idx)
+    insert_text = _required_string(edit, "text", idx)
+    occurrence = _occurrence(edit, idx)
+    return _insert_relative(text, anchor, insert_text, before=False, occurrence=occurrence, idx=idx)
+
+
+def _op_append_text(text: str, edit: dict, idx: int) -> str:
+    return text + _required_string(edit, "text", idx)
+
+
+def _op_prepend_text(text: str, edit: dict, idx: int) -> str:
+    return _required_string(edit, "text", idx) + text
+
+
+def _op_replace_entire_file(text: str, edit: dict, idx: int) -> str:
+    return _required_string(edit, "content", idx)
 
 
 def _replace_once(haystack: str, old: str, new: str, occurrence: int | None, idx: int) -> str:
     pos = _find_occurrence(haystack, old, occurrence, idx, "old")
+    if occurrence is None:
+        # The match is unique, so the first occurrence is the one to replace.
+        return haystack.replace(old, new, 1)
     return haystack[:pos] + new + haystack[pos + len(old):]
 
 
@@ -376,3 +669,14 @@ def _insert_relative(
     if before:
         return haystack[:pos] + text + haystack[pos:]
     return haystack[:pos + len(anchor)] + text + haystack[pos + len(anchor):]
+
+
+_TEXT_EDIT_HANDLERS: dict[str, Callable[[str, dict, int], str]] = {
+    "replace_snippet": _op_replace_snippet,
+    "delete_snippet": _op_delete_snippet,
+    "insert_before": _op_insert_before,
+    "insert_after": _op_insert_after,
+    "append_text": _op_append_text,
+    "prepend_text": _op_prepend_text,
+    "replace_entire_file": _op_replace_entire_file,
+}
@@ -1,10 +1,26 @@
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise.
+    orjson = None
+
 
 class RunHistory:
+    """
+    Attempt history persisted as an indented JSON array.
+
+    Only the most recent entry may still be mutated after it is flushed (the
+    loop fills in compile/run results on it), so flush() re-serializes that
+    entry plus any newly appended ones and rewrites the file from where they
+    start instead of dumping the whole list again.
+    """
+
     def __init__(self, history_file: str):
         self.history_file = history_file
         self.entries: list[dict] = []
+        self._frozen_count = 0
+        self._tail_offset = 0
 
     @staticmethod
     def lines(text: str | None):
@@ -18,5 +34,38 @@ class RunHistory:
         return self.entries[-1]
 
     def flush(self) -> None:
-        with open(self.history_file, "w") as f:
-            json.dump(self.entries, f, indent=4)
+        if not self.entries:
+            with open(self.history_file, "wb") as f:
+                f.write(b"[]")
+            self._frozen_count = 0
+            self._tail_offset = 0
+            return
+
+        offset = self._tail_offset
+        last_offset = offset
+        chunks: list[bytes] = []
+        for idx in range(self._frozen_count, len(self.entries)):
+            # Entries are nested one level deep inside the top-level array.
+            body = _dumps_indented(self.entries[idx]).replace(b"\n", b"\n  ")
+            chunk = (b"[\n  " if idx == 0 else b",\n  ") + body
+            last_offset = offset
+            offset += len(chunk)
+            chunks.append(chunk)
+        chunks.append(b"\n]")
+
+        with open(self.history_file, "r+b" if self._tail_offset else "wb") as f:
+            f.seek(self._tail_offset)
+            f.write(b"".join(chunks))
+            f.truncate()
+
+        self._frozen_count = len(self.entries) - 1
+        self._tail_offset = last_offset
+
+
+def _dumps_indented(entry: dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(entry, indent=2).encode()
@@ -1,77 +1,183 @@
+import hashlib
+import json
 import os
+import re
 import subprocess
 import sys
+import tempfile
+import time
 
 from agent.prompting import build_llm_system_prompt
+from agent.workspace import ensure_dir
 
+_FENCE_LINE_RE = re.compile(r"^```.*$", re.MULTILINE)
 FALLBACK_SOURCE = "    .global _start\n_start:\n    mov r0, #42\n"
+LLM_CACHE_TTL_SEC = 7 * 24 * 3600
+
+# Cache keys already answered from the cache in this process. A second request
+# with the same key means the cached response did not help, so it goes to the LLM.
+_served_cache_keys: set[str] = set()
 
 
 def strip_markdown_fences(text: str) -> str:
-    lines = text.split("\n")
-    has_fence = any(line.startswith("```") for line in lines)
-    if not has_fence:
+    # Splitting on whole fence lines leaves each block's text between a leading
+    # and a trailing "\n"; an unclosed final block has no trailing one.
+    segments = _FENCE_LINE_RE.split(text)
+    if len(segments) == 1:
         return text
 
-    code_lines = []
-    in_code_block = False
-    for line in lines:
-        if line.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if in_code_block:
-            code_lines.append(line)
+    code_lines: list[str] = []
+    blocks = segments[1::2]
+    last_closed = len(segments) % 2 == 1
+    for block_idx, block in enumerate(blocks):
+        block_lines = block.split("\n")
+        closed = last_closed or block_idx < len(blocks) - 1
+        code_lines.extend(block_lines[1:-1] if closed else block_lines[1:])
     return "\n".join(code_lines)
 
 
+def _write_prompt_parts(write, prompt_parts: list[str]) -> None:
+    for idx, part in enumerate(prompt_parts):
+        if idx:
+            write("\n")
+        write(part)
+
+
+def _llm_cache_key(task_contract_prompt: str, input_prompt: str) -> str:
+    # The system prompt embeds the timestamped run directory, so it is left out
+    # of the key; everything the task and retry feedback depend on is kept.
+    digest = hashlib.sha256(b"gemini\0")
+    digest.update(task_contract_prompt.encode())
+    digest.update(b"\0")
+    digest.update(input_prompt.encode())
+    return digest.hexdigest()
+
+
+def _load_llm_cache(cache_file: str) -> dict:
+    try:
+        with open(cache_file, "rb") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[LLM] Ignoring unreadable response cache {cache_file}: {e}")
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _store_llm_cache(cache_file: str, key: str, response: str) -> None:
+    now = time.time()
+    cache = {
+        cached_key: entry
+        for cached_key, entry in _load_llm_cache(cache_file).items()
+        if isinstance(entry, dict) and now - entry.get("created", 0) < LLM_CACHE_TTL_SEC
+    }
+    cache[key] = {"created": now, "response": response}
+    tmp_file = None
+    try:
+        # A per-writer temp name, so concurrent runs of one prompt never write
+        # into each other's file before it is moved into place.
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(cache_file) or ".", prefix=".llm_cache.", suffix=".tmp", delete=False
+        ) as f:
+            tmp_file = f.name
+            json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"[LLM] Could not update response cache {cache_file}: {e}")
+        if tmp_file is not None:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+
+def store_llm_response(cache_file: str, input_prompt: str, response: str, task_contract_prompt: str = "") -> None:
+    """
+    Cache a response whose attempt succeeded, keyed like call_llm's lookup.
+    Failed attempts are never stored, so rerunning a failed run asks the LLM again.
+    """
+    _store_llm_cache(cache_file, _llm_cache_key(task_contract_prompt, input_prompt), response)
+
+
 def call_llm(
     input_prompt: str,
     writable_dir: str,
     log_dir: str,
     task_contract_prompt: str = "",
+    cache_file: str | None = None,
 ) -> str:
     """
     Call the local `gemini` CLI and return generated source text.
+
+    With cache_file set, a response stored by store_llm_response for an
+    identical task contract and prompt (within LLM_CACHE_TTL_SEC) is returned
+    instead of calling the CLI, at most once per process for each prompt.
     """
+    cache_key = None
+    if cache_file is not None:
+        cache_key = _llm_cache_key(task_contract_prompt, input_prompt)
+        if cache_key not in _served_cache_keys:
+            cached = _load_llm_cache(cache_file).get(cache_key)
+            if (
+                isinstance(cached, dict)
+                and isinstance(cached.get("response"), str)
+                and time.time() - cached.get("created", 0) < LLM_CACHE_TTL_SEC
+            ):
+                _served_cache_keys.add(cache_key)
+                print(f"\n[LLM] Reusing cached response for prompt {cache_key[:12]} from {cache_file}")
+                print(f"[LLM] --- Code Received ---\n{cached['response']}\n---------------------------")
+                return cached["response"]
+
     prompt_parts = [build_llm_system_prompt(writable_dir)]
     if task_contract_prompt:
         prompt_parts.append(task_contract_prompt)
     prompt_parts.append(input_prompt)
-    prompt = "\n".join(prompt_parts)
-    print(f"\n[LLM] Generating code... (Prompt length: {len(prompt)})")
-    print(f"[LLM] --- Prompt Sent ---\n{prompt}\n-----------------------")
+    # The parts are streamed to each sink separately; the joined prompt is only
+    # built when it has to be passed as a command-line argument.
+    prompt_len = sum(map(len, prompt_parts)) + len(prompt_parts) - 1
+    print(f"\n[LLM] Generating code... (Prompt length: {prompt_len})")
+    print("[LLM] --- Prompt Sent ---", *prompt_parts, "-----------------------", sep="\n")
 
-    os.makedirs(log_dir, exist_ok=True)
+    ensure_dir(log_dir)
     prompt_file = os.path.join(log_dir, "current_prompt.txt")
     with open(prompt_file, "w") as f:
-        f.write(prompt)
+        _write_prompt_parts(f.write, prompt_parts)
 
     debug_log_path = os.path.join(log_dir, "llm_debug.log")
     print(f"[LLM] --- Streaming Response (Debug logs routed to {debug_log_path}) ---")
     try:
         with open(debug_log_path, "a") as debug_file:
-            debug_file.write(f"\n\n--- New Prompt Execution (Length: {len(prompt)}) ---\n")
-            use_stdin_prompt = len(prompt) > 8000
-            gemini_cmd = ["gemini", "-d"] if use_stdin_prompt else ["gemini", "-d", prompt]
+            debug_file.write(f"\n\n--- New Prompt Execution (Length: {prompt_len}) ---\n")
+            use_stdin_prompt = prompt_len > 8000
+            gemini_cmd = ["gemini", "-d"] if use_stdin_prompt else ["gemini", "-d", "\n".join(prompt_parts)]
             process = subprocess.Popen(
                 gemini_cmd,
                 stdin=subprocess.PIPE if use_stdin_prompt else None,
                 stdout=subprocess.PIPE,
                 stderr=debug_file,
-                text=True,
-                bufsize=1,
             )
 
             if use_stdin_prompt and process.stdin is not None:
-                process.stdin.write(prompt)
-                process.stdin.close()
+                stdin = process.stdin
+                _write_prompt_parts(lambda text: stdin.write(text.encode()), prompt_parts)
+                stdin.close()
 
-            response_lines = []
+            response_chunks: list[bytes] = []
             if process.stdout is not None:
-                for line in iter(process.stdout.readline, ""):
-                    sys.stdout.write(line)
-                    sys.stdout.flush()
-                    response_lines.append(line)
+                sys.stdout.flush()
+                echo = getattr(sys.stdout, "buffer", None)
+                # Read the fd directly for prompt streaming; stdin keeps its buffered
+                # writer, which writes each prompt part in full.
+                stdout_fd = process.stdout.fileno()
+                while chunk := os.read(stdout_fd, 65536):
+                    if echo is not None:
+                        echo.write(chunk)
+                        echo.flush()
+                    else:
+                        sys.stdout.write(chunk.decode(errors="replace"))
+                        sys.stdout.flush()
+                    response_chunks.append(chunk)
                 process.stdout.close()
             process.wait()
 
@@ -79,9 +185,17 @@ def call_llm(
             print(f"[LLM] Error calling Gemini CLI. Check {debug_log_path} for details.")
             return FALLBACK_SOURCE
 
-        response = "".join(response_lines)
+        # Decode once, with the same newline translation the text-mode pipe applied.
+        response = (
+            b"".join(response_chunks)
+            .decode("utf-8", errors="replace")
+            .replace("\r\n", "\n")
+            .replace("\r", "\n")
+        )
         final_code = strip_markdown_fences(response)
         print(f"[LLM] --- Code Received ---\n{final_code}\n---------------------------")
+        if cache_key is not None:
+            _served_cache_keys.add(cache_key)
         return final_code
     except OSError as e:
         print(f"[LLM] Error calling Gemini CLI: {e}")
@@ -3,7 +3,7 @@ import os
 
 from agent.edits import apply_workspace_edit_instructions, parse_edit_instructions
 from agent.history import RunHistory
-from agent.llm_client import call_llm
+from agent.llm_client import call_llm, store_llm_response
 from agent.models import LoopConfig
 from agent.repo_context import build_repo_attempt_context
 from agent.retry_policy import decide_next_retry
@@ -13,20 +13,61 @@ from agent.response_filters import (
     validate_arm_asm_source_text,
 )
 from agent.toolchain import compile_code, run_in_simulator, run_repo_verification
-from agent.workspace import snapshot_successful_run
+from agent.workspace import ensure_dir, snapshot_successful_run, write_text_atomic
+
+# Every history entry has these keys, in this order; each attempt fills in the
+# ones it knows about and later stages update the rest in place.
+_HISTORY_ENTRY_TEMPLATE: dict = {
+    "attempt": None,
+    "prompt": None,
+    "response_mode": None,
+    "repo_context_files": None,
+    "generated_code": None,
+    "diff": None,
+    "edited_files": None,
+    "edit_operations": None,
+    "edit_apply_success": None,
+    "edit_apply_error": None,
+    "edit_output_sanitized": None,
+    "compile_success": None,
+    "compile_error": None,
+    "run_success": None,
+    "run_output": None,
+    "timed_out": None,
+    "attempt_result": None,
+}
 
 
 def run_agent_loop(config: LoopConfig) -> None:
     current_prompt = config.initial_prompt
     response_mode = "full_source"
     last_attempt_feedback = ""
+    # Validation depends only on the text, so a repeated response reuses the last result.
+    last_validated_source: str | None = None
+    last_validation_error: str | None = None
+    # (text, text.splitlines(keepends=True)) for the last source that was diffed.
+    source_lines: tuple[str, list[str]] = ("", [])
+    # Source text -> (attempt, compile result, run result) for deterministic
+    # failures, so an identical regenerated source is not rebuilt and rerun.
+    failed_results: dict[str, tuple[int, tuple[bool, str], tuple[bool, str, bool] | None]] = {}
     run_history = RunHistory(config.history_file)
 
     current_source = ""
-    if os.path.exists(config.source_file):
+    # Text this loop last wrote to source_file (None until the first write).
+    written_source: str | None = None
+    try:
         with open(config.source_file, "r") as f:
             current_source = f.read()
+    except FileNotFoundError:
+        pass
+    else:
         print(f"[Info] Loaded existing working source from {config.source_file} for iterative updates")
+
+    # The source file's directory never changes, so it is created once up front.
+    source_parent = os.path.dirname(config.source_file)
+    if source_parent:
+        ensure_dir(source_parent)
+
     if config.incremental and (current_source or config.repo_mode):
         response_mode = "edits"
         print("[Info] Incremental mode enabled; starting retries in JSON edits mode.")
@@ -49,6 +90,7 @@ def run_agent_loop(config: LoopConfig) -> None:
             writable_dir=config.edit_dir,
             log_dir=config.run_dir,
             task_contract_prompt=config.task_contract_prompt,
+            cache_file=config.llm_cache_file,
         )
         previous_code = current_source
         parsed_edits = None
@@ -59,21 +101,30 @@ def run_agent_loop(config: LoopConfig) -> None:
                 parsed_edits, edit_output_sanitized = parse_edit_instructions(llm_response)
                 if edit_output_sanitized:
                     print("[Loop] Stripped non-JSON wrapper text from edits response before applying.")
+                file_contents: dict[str, str] = {}
                 edited_files = apply_workspace_edit_instructions(
                     config.edit_dir,
                     parsed_edits,
                     default_path=config.entry_file_rel,
+                    file_contents=file_contents,
                 )
-                if not os.path.exists(config.source_file):
-                    raise ValueError(
-                        f"Incremental edits removed required source file '{config.entry_file_rel}'"
-                    )
-                with open(config.source_file, "r") as f:
-                    generated_code = f.read()
+                generated_code = file_contents.get(config.entry_file_rel)
+                if generated_code is None:
+                    # The edits never touched the entry file; read it from disk.
+                    try:
+                        with open(config.source_file, "r") as f:
+                            generated_code = f.read()
+                    except FileNotFoundError:
+                        raise ValueError(
+                            f"Incremental edits removed required source file '{config.entry_file_rel}'"
+                        ) from None
             except ValueError as e:
                 print(f"[Loop] Could not apply edit response: {e}")
+                # The edits may have changed or removed the entry file before failing.
+                written_source = None
                 run_history.append(
                     {
+                        **_HISTORY_ENTRY_TEMPLATE,
                         "attempt": attempt,
                         "prompt": attempt_prompt,
                         "response_mode": response_mode,
@@ -85,11 +136,6 @@ def run_agent_loop(config: LoopConfig) -> None:
                         "edit_apply_success": False,
                         "edit_apply_error": str(e),
                         "edit_output_sanitized": edit_output_sanitized,
-                        "compile_success": None,
-                        "compile_error": None,
-                        "run_success": None,
-                        "run_output": None,
-                        "timed_out": None,
                         "attempt_result": "edit_apply_failed",
                     }
                 )
@@ -122,27 +168,38 @@ def run_agent_loop(config: LoopConfig) -> None:
                     print(f"[Loop] {extraction_note} from full-source response before validation.")
                 generated_code = extracted_source
 
-        source_validation_error = None if config.repo_mode else validate_arm_asm_source_text(generated_code)
+        applied_edit_fields = (
+            {
+                "edited_files": edited_files,
+                "edit_operations": parsed_edits,
+                "edit_apply_success": True,
+                "edit_output_sanitized": edit_output_sanitized,
+            }
+            if response_mode == "edits"
+            else {}
+        )
+
+        if config.repo_mode:
+            source_validation_error = None
+        elif generated_code == last_validated_source:
+            source_validation_error = last_validation_error
+        else:
+            source_validation_error = validate_arm_asm_source_text(generated_code)
+            last_validated_source = generated_code
+            last_validation_error = source_validation_error
         if source_validation_error:
             print(f"[Loop] Rejected non-assembly response before writing source: {source_validation_error}")
             run_history.append(
                 {
+                    **_HISTORY_ENTRY_TEMPLATE,
+                    **applied_edit_fields,
                     "attempt": attempt,
                     "prompt": attempt_prompt,
                     "response_mode": response_mode,
                     "repo_context_files": repo_context_files,
                     "generated_code": generated_code.splitlines(),
                     "diff": [],
-                    "edited_files": edited_files if response_mode == "edits" else None,
-                    "edit_operations": parsed_edits if response_mode == "edits" else None,
-                    "edit_apply_success": True if response_mode == "edits" else None,
-                    "edit_apply_error": None,
-                    "edit_output_sanitized": edit_output_sanitized if response_mode == "edits" else None,
-                    "compile_success": None,
                     "compile_error": [f"Source validation failed: {source_validation_error}"],
-                    "run_success": None,
-                    "run_output": None,
-                    "timed_out": None,
                     "attempt_result": "source_validation_failed",
                 }
             )
@@ -161,34 +218,34 @@ def run_agent_loop(config: LoopConfig) -> None:
             response_mode = retry_decision.next_mode
             continue
 
-        diff = list(
-            difflib.unified_diff(
-                previous_code.splitlines(keepends=True),
-                generated_code.splitlines(keepends=True),
-                fromfile=f"Attempt_{attempt-1}",
-                tofile=f"Attempt_{attempt}",
+        if generated_code == previous_code:
+            # No-progress retries are common; an identical source has an empty diff.
+            diff_str = ""
+        else:
+            if source_lines[0] is not previous_code:
+                source_lines = (previous_code, previous_code.splitlines(keepends=True))
+            generated_lines = generated_code.splitlines(keepends=True)
+            diff_str = "".join(
+                difflib.unified_diff(
+                    source_lines[1],
+                    generated_lines,
+                    fromfile=f"Attempt_{attempt-1}",
+                    tofile=f"Attempt_{attempt}",
+                )
             )
-        )
-        diff_str = "".join(diff)
+            # The next attempt diffs against this source; keep its lines.
+            source_lines = (generated_code, generated_lines)
 
         run_history.append(
             {
+                **_HISTORY_ENTRY_TEMPLATE,
+                **applied_edit_fields,
                 "attempt": attempt,
                 "prompt": attempt_prompt,
                 "response_mode": response_mode,
                 "repo_context_files": repo_context_files,
                 "generated_code": generated_code.splitlines(),
                 "diff": diff_str.splitlines(),
-                "edited_files": edited_files if response_mode == "edits" else None,
-                "edit_operations": parsed_edits if response_mode == "edits" else None,
-                "edit_apply_success": True if response_mode == "edits" else None,
-                "edit_apply_error": None,
-                "edit_output_sanitized": edit_output_sanitized if response_mode == "edits" else None,
-                "compile_success": None,
-                "compile_error": None,
-                "run_success": None,
-                "run_output": None,
-                "timed_out": None,
                 "attempt_result": "generated",
             }
         )
@@ -198,11 +255,14 @@ def run_agent_loop(config: LoopConfig) -> None:
 
         current_source = generated_code
 
-        source_parent = os.path.dirname(config.source_file)
-        if source_parent:
-            os.makedirs(source_parent, exist_ok=True)
-        with open(config.source_file, "w") as f:
-            f.write(generated_code)
+        if edited_files and config.entry_file_rel in edited_files:
+            # The edits have already written this exact text.
+            written_source = generated_code
+        elif config.repo_mode or generated_code != written_source:
+            # Repo build/test commands may rewrite the entry file, so only the
+            # assembly flow trusts that its last write is still on disk.
+            write_text_atomic(config.source_file, generated_code)
+            written_source = generated_code
 
         if config.repo_mode:
             verify_result = run_repo_verification(
@@ -210,6 +270,7 @@ def run_agent_loop(config: LoopConfig) -> None:
                 build_cmd=config.build_cmd or "",
                 test_cmd=config.test_cmd,
                 timeout_sec=config.verify_timeout_sec,
+                parallel=config.parallel_verify,
             )
             entry["verify_success"] = verify_result.success
             entry["verify_stage"] = verify_result.stage
@@ -242,25 +303,45 @@ def run_agent_loop(config: LoopConfig) -> None:
             entry["timed_out"] = False
             entry["attempt_result"] = "success"
             run_history.flush()
+            if config.llm_cache_file is not None:
+                store_llm_response(
+                    config.llm_cache_file,
+                    attempt_prompt,
+                    llm_response,
+                    task_contract_prompt=config.task_contract_prompt,
+                )
             snapshot_dir = snapshot_successful_run(config.code_dir)
             print("\n=== SUCCESS! Repository verification passed. ===")
             print(f"[Info] Snapshot saved to {snapshot_dir}")
             break
 
-        compile_success, compile_error = compile_code(
-            source_file=config.source_file,
-            elf_file=config.elf_file,
-            toolchain=config.toolchain,
-            code_dir=config.code_dir,
-            workspace=config.workspace,
-            binaries=config.toolchain_binaries,
-        )
+        if edited_files and any(path != config.entry_file_rel for path in edited_files):
+            # Other files in the run directory may be included by the source.
+            failed_results.clear()
+        reused = failed_results.get(generated_code)
+        if reused is not None:
+            reused_attempt, (compile_success, compile_error), run_result = reused
+            print(
+                f"[Loop] Source is identical to attempt {reused_attempt}, which failed; "
+                "reusing its compile/run result."
+            )
+        else:
+            compile_success, compile_error = compile_code(
+                source_file=config.source_file,
+                elf_file=config.elf_file,
+                toolchain=config.toolchain,
+                code_dir=config.code_dir,
+                workspace=config.workspace,
+                binaries=config.toolchain_binaries,
+            )
+            run_result = None
         entry["compile_success"] = compile_success
         entry["compile_error"] = RunHistory.lines(compile_error if compile_error else None)
 
         if not compile_success:
             entry["attempt_result"] = "compile_failed"
             run_history.flush()
+            failed_results.setdefault(generated_code, (attempt, (compile_success, compile_error), None))
             print("[Loop] Compilation failed. Feeding error back to agent...")
             last_attempt_feedback = (
                 "Compilation failed with this error output:\n"
@@ -280,26 +361,18 @@ def run_agent_loop(config: LoopConfig) -> None:
             response_mode = retry_decision.next_mode
             continue
 
-        run_success = False
-        run_output = ""
-        timed_out = False
-        current_timeout = config.timeout_sec
-
-        for _ in range(3):
-            success, output, t_out = run_in_simulator(
+        # The simulator used to be retried with doubling timeouts (t, 2t, 4t).
+        # A binary that finishes within any of them finishes within the last,
+        # so one run with that limit gives the same outcome without re-running.
+        run_timeout_sec = config.timeout_sec * 4
+        if run_result is None:
+            run_result = run_in_simulator(
                 elf_file=config.elf_file,
                 toolchain=config.toolchain,
                 binaries=config.toolchain_binaries,
-                timeout_sec=current_timeout,
+                timeout_sec=run_timeout_sec,
             )
-            run_output = output
-            if not t_out:
-                run_success = success
-                timed_out = False
-                break
-            print(f"[Simulator] Timed out after {current_timeout}s. Retrying with longer timeout...")
-            current_timeout *= 2
-            timed_out = True
+        run_success, run_output, timed_out = run_result
 
         if timed_out:
             entry["run_success"] = False
@@ -307,7 +380,7 @@ def run_agent_loop(config: LoopConfig) -> None:
             entry["timed_out"] = True
             entry["attempt_result"] = "run_timed_out"
             run_history.flush()
-            print("[Loop] Code consistently timed out. Feeding back to agent...")
+            print(f"[Loop] Code timed out after {run_timeout_sec}s in the simulator. Feeding back to agent...")
             last_attempt_feedback = (
                 f"Simulator output before timeout in {config.board_name}:\n"
                 f"{run_output}"
@@ -321,6 +394,7 @@ def run_agent_loop(config: LoopConfig) -> None:
                 expected_output=config.expected_output,
                 board_name=config.board_name,
                 run_output=run_output,
+                run_timeout_sec=run_timeout_sec,
             )
             current_prompt = retry_decision.next_prompt
             response_mode = retry_decision.next_mode
@@ -332,6 +406,8 @@ def run_agent_loop(config: LoopConfig) -> None:
             entry["timed_out"] = False
             entry["attempt_result"] = "run_output_mismatch" if run_success else "run_failed"
             run_history.flush()
+            # Timeouts are not recorded: they can depend on host load.
+            failed_results.setdefault(generated_code, (attempt, (compile_success, compile_error), run_result))
             print(f"[Loop] Runtime failed or output was incorrect. Output:\n{run_output}")
             last_attempt_feedback = (
                 "Runtime completed but expected output was not found. Full simulator output:\n"
@@ -356,6 +432,13 @@ def run_agent_loop(config: LoopConfig) -> None:
         entry["timed_out"] = False
         entry["attempt_result"] = "success"
         run_history.flush()
+        if config.llm_cache_file is not None:
+            store_llm_response(
+                config.llm_cache_file,
+                attempt_prompt,
+                llm_response,
+                task_contract_prompt=config.task_contract_prompt,
+            )
         snapshot_dir = snapshot_successful_run(config.code_dir)
         print("\n=== SUCCESS! The agent wrote working ARM code! ===")
         print("Final Output:\n", run_output)
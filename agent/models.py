@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from agent.toolchain import ToolchainBinaries
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoopConfig:
     toolchain: str
     incremental: bool
@@ -28,3 +28,5 @@ class LoopConfig:
     toolchain_binaries: ToolchainBinaries
     max_retries: int
     timeout_sec: int = 2
+    llm_cache_file: str | None = None
+    parallel_verify: bool = False
@@ -1,5 +1,30 @@
 import re
 
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_NO_NEWLINE_MARKER = "\\ No newline at end of file"
+
+
+def _parse_hunks(patch_lines: list[str], start: int):
+    """
+    Yield (start_old, [(op, text), ...]) for each hunk, with "\\ No newline"
+    markers dropped. Hunks are produced lazily so a malformed later header is
+    only reported once the hunks before it have applied.
+    """
+    i = start
+    while i < len(patch_lines):
+        header = patch_lines[i]
+        match = _HUNK_RE.match(header)
+        if not match:
+            raise ValueError(f"Malformed unified diff hunk header: {header.rstrip()}")
+        i += 1
+        body = []
+        while i < len(patch_lines) and not patch_lines[i].startswith("@@"):
+            line = patch_lines[i]
+            if not line.startswith(_NO_NEWLINE_MARKER):
+                body.append((line[:1], line[1:]))
+            i += 1
+        yield int(match.group(1)), body
+
 
 def apply_unified_diff_patch(original_text: str, patch_text: str) -> str:
     """
@@ -11,47 +36,27 @@ def apply_unified_diff_patch(original_text: str, patch_text: str) -> str:
     if hunk_start is None:
         raise ValueError("No unified diff hunk found in LLM response")
 
-    patch_lines = patch_lines[hunk_start:]
     original_lines = original_text.splitlines(keepends=True)
+    source_len = len(original_lines)
+    offsets = [0]
+    for off in range(1, fuzzy_window + 1):
+        offsets.extend([-off, off])
     output_lines = []
     orig_idx = 0
-    i = 0
-
-    hunk_re = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
 
-    while i < len(patch_lines):
-        header = patch_lines[i]
-        if not header.startswith("@@"):
-            raise ValueError(f"Unexpected patch content outside hunk: {header.rstrip()}")
-
-        match = hunk_re.match(header)
-        if not match:
-            raise ValueError(f"Malformed unified diff hunk header: {header.rstrip()}")
-
-        start_old = int(match.group(1))
+    for start_old, hunk_body in _parse_hunks(patch_lines, hunk_start):
         target_orig_idx = max(start_old - 1, 0)
-        hunk_begin = i
-        i += 1
-        while i < len(patch_lines) and not patch_lines[i].startswith("@@"):
-            i += 1
-        hunk_body = patch_lines[hunk_begin + 1:i]
-
-        expected_old_lines = []
-        for line in hunk_body:
-            if line.startswith("\\ No newline at end of file"):
-                continue
-            if not line:
-                continue
-            if line[0] in (" ", "-"):
-                expected_old_lines.append(line[1:])
+        expected_old_lines = [text for op, text in hunk_body if op == " " or op == "-"]
+        expected_len = len(expected_old_lines)
+        first_old = expected_old_lines[0] if expected_old_lines else None
 
         def old_lines_match_at(start_idx: int) -> bool:
-            probe_idx = start_idx
-            for expected_line in expected_old_lines:
-                if probe_idx >= len(original_lines) or original_lines[probe_idx] != expected_line:
-                    return False
-                probe_idx += 1
-            return True
+            # Probe the first line before slicing, so a misaligned offset costs a single
+            # string compare. The slice compare is one C-level list comparison; a slice
+            # running past the end is shorter and never equal.
+            if expected_len and (start_idx >= source_len or original_lines[start_idx] != first_old):
+                return False
+            return original_lines[start_idx:start_idx + expected_len] == expected_old_lines
 
         candidate_orig_idx = None
         preferred = max(target_orig_idx, orig_idx)
@@ -59,10 +64,7 @@ def apply_unified_diff_patch(original_text: str, patch_text: str) -> str:
             candidate_orig_idx = preferred
         else:
             min_idx = max(orig_idx, target_orig_idx - fuzzy_window)
-            max_idx = min(len(original_lines), target_orig_idx + fuzzy_window)
-            offsets = [0]
-            for off in range(1, fuzzy_window + 1):
-                offsets.extend([-off, off])
+            max_idx = min(source_len, target_orig_idx + fuzzy_window)
             for off in offsets:
                 idx = target_orig_idx + off
                 if idx < min_idx or idx > max_idx:
@@ -81,33 +83,31 @@ def apply_unified_diff_patch(original_text: str, patch_text: str) -> str:
         if candidate_orig_idx is None:
             raise ValueError("Patch context does not match current source")
 
+        if expected_len == len(hunk_body) and all(op == " " for op, _ in hunk_body):
+            # Context-only hunk: alignment already matched every line, so copy the block as is.
+            output_lines.extend(original_lines[orig_idx:candidate_orig_idx + expected_len])
+            orig_idx = candidate_orig_idx + expected_len
+            continue
+
         output_lines.extend(original_lines[orig_idx:candidate_orig_idx])
         orig_idx = candidate_orig_idx
-        hunk_idx = 0
 
-        while hunk_idx < len(hunk_body):
-            line = hunk_body[hunk_idx]
-            if line.startswith("\\ No newline at end of file"):
-                hunk_idx += 1
-                continue
-            if not line:
-                raise ValueError("Empty patch line in hunk")
-            op = line[0]
-            text = line[1:]
+        for op, text in hunk_body:
             if op == " ":
-                if orig_idx >= len(original_lines) or original_lines[orig_idx] != text:
+                if orig_idx >= source_len or original_lines[orig_idx] != text:
                     raise ValueError("Patch context does not match current source")
                 output_lines.append(original_lines[orig_idx])
                 orig_idx += 1
             elif op == "-":
-                if orig_idx >= len(original_lines) or original_lines[orig_idx] != text:
+                if orig_idx >= source_len or original_lines[orig_idx] != text:
                     raise ValueError("Patch deletion does not match current source")
                 orig_idx += 1
             elif op == "+":
                 output_lines.append(text)
+            elif not op:
+                raise ValueError("Empty patch line in hunk")
             else:
                 raise ValueError(f"Unsupported patch line prefix: {op}")
-            hunk_idx += 1
 
     output_lines.extend(original_lines[orig_idx:])
     return "".join(output_lines)
@@ -1,8 +1,10 @@
 import os
+from functools import lru_cache
 
 from agent.constants import WORKSPACE
 
 
+@lru_cache(maxsize=8)
 def build_llm_system_prompt(code_dir: str) -> str:
     """
     Constrain the agent to the active per-prompt output folder.
@@ -21,6 +23,26 @@ def build_llm_system_prompt(code_dir: str) -> str:
     )
 
 
+def clip_tool_output(text: str | None, max_lines: int = 80, max_chars: int = 4096) -> str | None:
+    """
+    Shorten compiler/simulator/verification output before it is embedded in a
+    retry prompt. The head (usually the first error) and the tail (the latest
+    output) are kept; run history still records the full text.
+    """
+    if text is None:
+        return text
+    lines = text.splitlines()
+    if len(lines) <= max_lines and len(text) <= max_chars:
+        return text
+    if len(lines) > max_lines:
+        head = "\n".join(lines[: max_lines // 2])[: max_chars // 2]
+        tail = "\n".join(lines[-(max_lines // 2):])[-(max_chars // 2):]
+    else:
+        # Few but long lines (e.g. one huge line): clip characters from both ends.
+        head, tail = text[: max_chars // 2], text[-(max_chars // 2):]
+    return f"{head}\n... [output truncated] ...\n{tail}"
+
+
 def build_task_contract_prompt(
     prompt_name: str,
     toolchain: str,
@@ -75,43 +97,51 @@ def build_repo_task_contract_prompt(
     )
 
 
+# Identical on every edits-mode retry, so it leads the retry prompt and the
+# leading bytes sent after the task contract stay the same from attempt to attempt.
+_EDIT_RESPONSE_INSTRUCTIONS = (
+    "Return ONLY JSON with this shape (no prose, no markdown):\n"
+    "{\n"
+    '  "edits": [\n'
+    "    {\n"
+    '      "op": "replace_snippet",\n'
+    '      "path": "relative/path/to/file",\n'
+    '      "new_path": "relative/path/to/new_file",\n'
+    '      "old": "...",\n'
+    '      "new": "...",\n'
+    '      "anchor": "...",\n'
+    '      "text": "...",\n'
+    '      "content": "...",\n'
+    '      "occurrence": 1\n'
+    "    }\n"
+    "  ]\n"
+    "}\n"
+    "JSON EDIT RULES (critical):\n"
+    "- Allowed op values: replace_snippet, delete_snippet, insert_before, insert_after, append_text, prepend_text, replace_entire_file, create_file, delete_file, move_file.\n"
+    "- `path` must be a relative path under the active writable folder. Never use absolute paths and never use `..` segments.\n"
+    "- For text edit ops, omit `path` only when editing `agent_code.s`; include `path` for any other file.\n"
+    "- `create_file` requires `path` + `content`. `delete_file` requires `path`. `move_file` requires `path` + `new_path`.\n"
+    "- Only include fields required by the chosen op.\n"
+    "- `replace_snippet` and `delete_snippet` must use exact snippets from the CURRENT file.\n"
+    "- If a snippet may appear multiple times, set `occurrence` (1-based).\n"
+    "- Do not include explanations, markdown fences, or any non-JSON text.\n"
+    "- Prefer a small number of focused edits over replacing the entire file.\n\n"
+)
+
+
 def build_edit_retry_prompt(current_source: str, issue_text: str) -> str:
     """
     Ask the LLM to minimally edit the current source instead of rewriting it.
+    The fixed instructions come first and the per-attempt feedback last.
     """
     return (
-        f"{issue_text}\n\n"
-        "Apply the smallest possible fix to the current `agent_code.s`.\n"
-        "Return ONLY JSON with this shape (no prose, no markdown):\n"
-        "{\n"
-        '  "edits": [\n'
-        "    {\n"
-        '      "op": "replace_snippet",\n'
-        '      "path": "relative/path/to/file",\n'
-        '      "new_path": "relative/path/to/new_file",\n'
-        '      "old": "...",\n'
-        '      "new": "...",\n'
-        '      "anchor": "...",\n'
-        '      "text": "...",\n'
-        '      "content": "...",\n'
-        '      "occurrence": 1\n'
-        "    }\n"
-        "  ]\n"
-        "}\n"
-        "JSON EDIT RULES (critical):\n"
-        "- Allowed op values: replace_snippet, delete_snippet, insert_before, insert_after, append_text, prepend_text, replace_entire_file, create_file, delete_file, move_file.\n"
-        "- `path` must be a relative path under the active writable folder. Never use absolute paths and never use `..` segments.\n"
-        "- For text edit ops, omit `path` only when editing `agent_code.s`; include `path` for any other file.\n"
-        "- `create_file` requires `path` + `content`. `delete_file` requires `path`. `move_file` requires `path` + `new_path`.\n"
-        "- Only include fields required by the chosen op.\n"
-        "- `replace_snippet` and `delete_snippet` must use exact snippets from the CURRENT file.\n"
-        "- If a snippet may appear multiple times, set `occurrence` (1-based).\n"
-        "- Do not include explanations, markdown fences, or any non-JSON text.\n"
-        "- Prefer a small number of focused edits over replacing the entire file.\n\n"
+        f"{_EDIT_RESPONSE_INSTRUCTIONS}"
         "Current `agent_code.s`:\n"
         "```assembly\n"
         f"{current_source}\n"
-        "```\n"
+        "```\n\n"
+        f"{issue_text}\n\n"
+        "Apply the smallest possible fix to the current `agent_code.s`.\n"
     )
 
 
@@ -131,17 +161,18 @@ def build_edit_apply_issue_prompt(error: str, last_attempt_feedback: str) -> str
 
 
 def build_edit_apply_fallback_full_source_prompt(current_source: str, edit_apply_issue: str) -> str:
+    # Source first and attempt-specific feedback last, as in build_edit_retry_prompt.
     return (
+        "Current `agent_code.s`:\n"
+        "```assembly\n"
+        f"{current_source}\n"
+        "```\n\n"
         f"{edit_apply_issue}"
         "Your intended fix may be directionally correct, but the edit instructions were not "
         "safe to apply to the current file exactly.\n\n"
         "For the next retry, do NOT return JSON edits.\n"
         "Return ONLY a full replacement for `agent_code.s` (no prose, no markdown).\n"
-        "Make the smallest logical fix needed while preserving the working parts.\n\n"
-        "Current `agent_code.s`:\n"
-        "```assembly\n"
-        f"{current_source}\n"
-        "```\n"
+        "Make the smallest logical fix needed while preserving the working parts.\n"
     )
 
 
@@ -186,17 +217,19 @@ def build_verification_failure_full_source_prompt(stage: str | None, output: str
     )
 
 
-def build_timeout_edit_issue(board_name: str, run_output: str) -> str:
+def build_timeout_edit_issue(board_name: str, run_output: str, timeout_sec: int) -> str:
     return (
-        f"The code compiled successfully, but running it in {board_name} timed out after multiple attempts.\n"
+        f"The code compiled successfully, but running it in {board_name} timed out "
+        f"after {timeout_sec} seconds (it was run once with that limit).\n"
         f"Output before timeout:\n{run_output}\n\n"
         "Ensure you are not stuck in an infinite loop before printing the required output. Please fix the logic."
     )
 
 
-def build_timeout_full_source_prompt(board_name: str, run_output: str) -> str:
+def build_timeout_full_source_prompt(board_name: str, run_output: str, timeout_sec: int) -> str:
     return (
-        f"The code compiled successfully, but running it in {board_name} timed out after multiple attempts.\n"
+        f"The code compiled successfully, but running it in {board_name} timed out "
+        f"after {timeout_sec} seconds (it was run once with that limit).\n"
         f"Output before timeout:\n{run_output}\n\n"
         "Ensure you are not stuck in an infinite loop before printing the required output. "
         "Please fix the logic and try again. Return ONLY the corrected assembly/C code."
@@ -237,8 +270,8 @@ def build_compile_failure_patch_issue(compile_error: str) -> str:
     return build_compile_failure_edit_issue(compile_error)
 
 
-def build_timeout_patch_issue(board_name: str, run_output: str) -> str:
-    return build_timeout_edit_issue(board_name, run_output)
+def build_timeout_patch_issue(board_name: str, run_output: str, timeout_sec: int) -> str:
+    return build_timeout_edit_issue(board_name, run_output, timeout_sec)
 
 
 def build_output_mismatch_patch_issue(expected_output: str, run_output: str) -> str:
@@ -1,6 +1,31 @@
 import re
-
-
+from functools import lru_cache
+
+# Line classifiers shared by extract_arm_asm_block and validate_arm_asm_source_text;
+# compiled once instead of on every call.
+_DIRECTIVE_RE = re.compile(r"^\s*\.[A-Za-z_][\w.]*\b")
+_LABEL_ONLY_RE = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(?:[@;].*)?$")
+_LABEL_PREFIX_RE = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(.*)$")
+_PREPROC_RE = re.compile(r"^\s*#(?:include|define|if|ifdef|ifndef|elif|else|endif|pragma|error|warning)\b")
+_INSTR_RE = re.compile(r"^\s*[A-Za-z][A-Za-z0-9_.]*\b(?:\s+.*)?$")
+
+_NOISE_PREFIXES = ("ClearcutLogger:",)
+_REJECT_PREFIXES = (
+    "ClearcutLogger:",
+    "Info:",
+    "Warning:",
+    "Error:",
+    "I will ",
+    "I'll ",
+    "Let me ",
+    "Here is ",
+    "```",
+    "# ",
+    "##",
+)
+
+
+@lru_cache(maxsize=32)
 def sanitize_unified_diff_patch_text(patch_text: str, original_text: str | None = None) -> str:
     """
     Keep only the unified diff portion of a patch response and drop trailing
@@ -64,9 +89,6 @@ def sanitize_full_source_text(source_text: str) -> str:
     Strip known leaked CLI/debug log lines from the end of a full-source response.
     Keep this conservative so we do not remove legitimate code.
     """
-    noise_prefixes = (
-        "ClearcutLogger:",
-    )
     lines = source_text.splitlines(keepends=True)
     if not lines:
         return source_text
@@ -74,7 +96,7 @@ def sanitize_full_source_text(source_text: str) -> str:
     removed_any = False
     while lines:
         line = lines[-1]
-        if any(line.startswith(prefix) for prefix in noise_prefixes):
+        if line.startswith(_NOISE_PREFIXES):
             lines.pop()
             removed_any = True
             continue
@@ -92,10 +114,6 @@ def extract_arm_asm_block(source_text: str) -> tuple[str, str | None]:
     if not lines:
         return source_text, None
 
-    directive_re = re.compile(r"^\s*\.[A-Za-z_][\w.]*\b")
-    label_only_re = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(?:[@;].*)?$")
-    label_prefix_re = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(.*)$")
-    instr_re = re.compile(r"^\s*[A-Za-z][A-Za-z0-9_.]*\b(?:\s+.*)?$")
 
     def looks_asm_line(raw: str) -> bool:
         stripped = raw.strip()
@@ -103,17 +121,17 @@ def extract_arm_asm_block(source_text: str) -> tuple[str, str | None]:
             return False
         if stripped.startswith(("@", ";", "//", "/*", "*", "*/")):
             return True
-        if directive_re.match(raw) or label_only_re.match(raw):
+        if _DIRECTIVE_RE.match(raw) or _LABEL_ONLY_RE.match(raw):
             return True
-        label_prefix = label_prefix_re.match(raw)
+        label_prefix = _LABEL_PREFIX_RE.match(raw)
         if label_prefix:
             tail = label_prefix.group(1).strip()
             if not tail:
                 return True
             if tail.startswith(("@", ";", "//", "/*", "*", "*/")):
                 return True
-            return bool(directive_re.match(tail) or instr_re.match(tail))
-        return bool(instr_re.match(raw))
+            return bool(_DIRECTIVE_RE.match(tail) or _INSTR_RE.match(tail))
+        return bool(_INSTR_RE.match(raw))
 
     for i in range(len(lines)):
         if not looks_asm_line(lines[i]):
@@ -133,26 +151,6 @@ def validate_arm_asm_source_text(source_text: str) -> str | None:
     Return an error string if the text contains obvious non-assembly/prose content.
     This is a conservative fail-closed guard before writing agent_code.s.
     """
-    directive_re = re.compile(r"^\s*\.[A-Za-z_][\w.]*\b")
-    label_only_re = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(?:[@;].*)?$")
-    label_prefix_re = re.compile(r"^\s*(?:[A-Za-z_.$][\w.$]*|\d+):\s*(.*)$")
-    preproc_re = re.compile(r"^\s*#(?:include|define|if|ifdef|ifndef|elif|else|endif|pragma|error|warning)\b")
-    instr_re = re.compile(r"^\s*[A-Za-z][A-Za-z0-9_.]*\b(?:\s+.*)?$")
-
-    reject_prefixes = (
-        "ClearcutLogger:",
-        "Info:",
-        "Warning:",
-        "Error:",
-        "I will ",
-        "I'll ",
-        "Let me ",
-        "Here is ",
-        "```",
-        "# ",
-        "##",
-    )
-
     saw_asm_like = False
     for lineno, raw_line in enumerate(source_text.splitlines(), 1):
         line = raw_line.rstrip("\r")
@@ -160,7 +158,7 @@ def validate_arm_asm_source_text(source_text: str) -> str | None:
         if not stripped:
             continue
 
-        if any(stripped.startswith(prefix) for prefix in reject_prefixes):
+        if stripped.startswith(_REJECT_PREFIXES):
             return f"Line {lineno} looks like prose/log output, not assembly: {stripped}"
 
         if "`" in stripped:
@@ -169,11 +167,11 @@ def validate_arm_asm_source_text(source_text: str) -> str | None:
         if stripped.startswith(("@", ";", "//", "/*", "*", "*/")):
             continue
 
-        if preproc_re.match(line) or directive_re.match(line) or label_only_re.match(line):
+        if _PREPROC_RE.match(line) or _DIRECTIVE_RE.match(line) or _LABEL_ONLY_RE.match(line):
             saw_asm_like = True
             continue
 
-        label_prefix = label_prefix_re.match(line)
+        label_prefix = _LABEL_PREFIX_RE.match(line)
         if label_prefix:
             tail = label_prefix.group(1).strip()
             if not tail:
@@ -182,13 +180,13 @@ def validate_arm_asm_source_text(source_text: str) -> str | None:
             if tail.startswith(("@", ";", "//", "/*", "*", "*/")):
                 saw_asm_like = True
                 continue
-            if preproc_re.match(tail) or directive_re.match(tail) or instr_re.match(tail):
+            if _PREPROC_RE.match(tail) or _DIRECTIVE_RE.match(tail) or _INSTR_RE.match(tail):
                 saw_asm_like = True
                 continue
             return f"Line {lineno} has a valid label but invalid code after ':': {tail}"
 
         # Allow mnemonics, macro invocations, and assembler pseudo-ops without leading dot.
-        if instr_re.match(line):
+        if _INSTR_RE.match(line):
             # Common prose signatures that still match the generic instruction regex.
             token = stripped.split(None, 1)[0].lower()
             if token in {"i", "here", "please", "note", "first", "then"}:
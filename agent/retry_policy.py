@@ -14,6 +14,7 @@ from agent.prompting import (
     build_verification_failure_issue,
     build_timeout_full_source_prompt,
     build_timeout_edit_issue,
+    clip_tool_output,
 )
 
 ResponseMode = Literal["full_source", "edits"]
@@ -28,7 +29,7 @@ RetryOutcome = Literal[
 ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RetryDecision:
     next_prompt: str
     next_mode: ResponseMode
@@ -49,10 +50,17 @@ def decide_next_retry(
     verification_stage: str | None = None,
     verification_timed_out: bool = False,
     run_output: str | None = None,
+    run_timeout_sec: int | None = None,
     validation_error: str | None = None,
     edit_apply_error: str | None = None,
     last_attempt_feedback: str = "",
 ) -> RetryDecision:
+    # Long tool logs are clipped before they reach a prompt: they would be resent
+    # on every retry and push the stable prompt prefix out of provider caches.
+    compile_error = clip_tool_output(compile_error)
+    verification_error = clip_tool_output(verification_error)
+    run_output = clip_tool_output(run_output)
+    last_attempt_feedback = clip_tool_output(last_attempt_feedback)
     if outcome == "edit_apply_failed":
         if not edit_apply_error:
             raise ValueError("edit_apply_error is required for edit_apply_failed")
@@ -142,16 +150,18 @@ def decide_next_retry(
     if outcome == "run_timed_out":
         if run_output is None:
             raise ValueError("run_output is required for run_timed_out")
+        if run_timeout_sec is None:
+            raise ValueError("run_timeout_sec is required for run_timed_out")
         if incremental:
             return RetryDecision(
                 next_prompt=build_edit_retry_prompt(
                     current_source,
-                    build_timeout_edit_issue(board_name, run_output),
+                    build_timeout_edit_issue(board_name, run_output, run_timeout_sec),
                 ),
                 next_mode="edits",
             )
         return RetryDecision(
-            next_prompt=build_timeout_full_source_prompt(board_name, run_output),
+            next_prompt=build_timeout_full_source_prompt(board_name, run_output, run_timeout_sec),
             next_mode="full_source",
         )
 
@@ -1,6 +1,7 @@
 import os
 import subprocess
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 DEFAULT_ARMCLANG_BIN = "/opt/arm/developmentstudio-2025.0-1/sw/ARMCompiler6.24/bin/armclang"
@@ -8,14 +9,14 @@ DEFAULT_ARMLINK_BIN = "/opt/arm/developmentstudio-2025.0-1/sw/ARMCompiler6.24/bi
 DEFAULT_FVP_BIN = "/opt/arm/developmentstudio-2025.0-1/bin/FVP_BaseR_Cortex-R52"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ToolchainBinaries:
     armclang_bin: str
     armlink_bin: str
     fvp_bin: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RepoVerifyResult:
     success: bool
     stage: str | None
@@ -31,6 +32,7 @@ def load_toolchain_binaries_from_env() -> ToolchainBinaries:
     )
 
 
+@lru_cache(maxsize=4)
 def get_target_details(toolchain: str) -> tuple[str, str]:
     if toolchain == "gcc":
         return "0x101F1000", "QEMU versatilepb"
@@ -151,9 +153,13 @@ def run_repo_verification(
     build_cmd: str,
     test_cmd: str | None = None,
     timeout_sec: int = 120,
+    parallel: bool = False,
 ) -> RepoVerifyResult:
     """
     Run build/test verification commands for repository mode.
+    With parallel=True the test command runs alongside the build instead of
+    after it (only safe when the tests do not need the build's output); the
+    result is reported exactly as for a sequential run.
     """
 
     def run_stage(stage: str, cmd: str) -> RepoVerifyResult:
@@ -190,12 +196,22 @@ def run_repo_verification(
             timed_out=False,
         )
 
-    build_result = run_stage("build", build_cmd)
+    if parallel and test_cmd:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            test_future = executor.submit(run_stage, "test", test_cmd)
+            build_result = run_stage("build", build_cmd)
+            test_result = test_future.result()
+    else:
+        build_result = run_stage("build", build_cmd)
+        test_result = None
     if not build_result.success:
         return build_result
 
     if test_cmd:
-        test_result = run_stage("test", test_cmd)
+        if test_result is None:
+            test_result = run_stage("test", test_cmd)
         if not test_result.success:
             return test_result
         return RepoVerifyResult(
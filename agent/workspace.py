@@ -1,8 +1,56 @@
 import os
 import shutil
+import tempfile
 from datetime import datetime
 
 
+SOURCE_CONTEXT_SUFFIXES = (".c", ".h", ".s", ".S", ".ld", "Makefile")
+_ensured_dirs: set[str] = set()
+# The process umask can only be read by setting it; do that once, at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def ensure_dir(path: str) -> None:
+    """
+    os.makedirs(path, exist_ok=True), skipped for directories already ensured this process.
+    """
+    abs_path = os.path.abspath(path)
+    if abs_path in _ensured_dirs:
+        return
+    os.makedirs(abs_path, exist_ok=True)
+    _ensured_dirs.add(abs_path)
+
+
+def write_text_atomic(path: str, text: str) -> None:
+    """
+    Write text to a uniquely named sibling temp file and rename it over path,
+    so readers (the compiler, a build command) never see a partially written
+    file. A symlinked path has its target replaced, and the temp file is
+    removed if anything fails.
+    """
+    target = os.path.realpath(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        try:
+            # Keep the existing file's permissions (repo-mode entry files may be executable).
+            shutil.copymode(target, tmp_path)
+        except FileNotFoundError:
+            # mkstemp creates 0600 files; a new file gets the mode open() would give it.
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def load_dotenv(dotenv_path: str) -> None:
     """
     Load simple KEY=VALUE pairs from a .env file into os.environ.
@@ -46,10 +94,11 @@ def make_timestamped_run_dir(prompt_run_dir: str) -> str:
     """
     Create and return a timestamped per-run artifact directory under prompt_run_dir.
     """
-    os.makedirs(prompt_run_dir, exist_ok=True)
+    ensure_dir(prompt_run_dir)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     run_dir = os.path.join(prompt_run_dir, timestamp)
     os.makedirs(run_dir, exist_ok=False)
+    _ensured_dirs.add(os.path.abspath(run_dir))
     return run_dir
 
 
@@ -80,7 +129,7 @@ def collect_existing_code_context(source_dir: str | None) -> str:
     print(f"--- Reading existing code from {source_dir} ---")
     for root, _, files in os.walk(source_dir):
         for file_name in files:
-            if not file_name.endswith((".c", ".h", ".s", ".S", ".ld", "Makefile")):
+            if not file_name.endswith(SOURCE_CONTEXT_SUFFIXES):
                 continue
             file_path = os.path.join(root, file_name)
             try:
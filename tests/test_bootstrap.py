@@ -0,0 +1,24 @@
+import unittest
+
+from agent.bootstrap import PromptTemplate
+
+
+class PromptTemplateTests(unittest.TestCase):
+    def test_escaped_braces_render_like_str_format(self):
+        text = "a {{x}} b {name}"
+        self.assertEqual(PromptTemplate(text).safe_substitute(name="n"), text.format(name="n"))
+        self.assertEqual(PromptTemplate(text).safe_substitute(name="n"), "a {x} b n")
+
+    def test_literal_json_snippet(self):
+        text = 'Send {{"addr": "{uart_addr}", "ops": [{{"op": "write"}}]}}'
+        self.assertEqual(
+            PromptTemplate(text).safe_substitute(uart_addr="0x9c090000"),
+            'Send {"addr": "0x9c090000", "ops": [{"op": "write"}]}',
+        )
+
+    def test_unknown_names_are_left_untouched(self):
+        self.assertEqual(PromptTemplate("{board_name} {other}").safe_substitute(board_name="FVP"), "FVP {other}")
+
+
+if __name__ == "__main__":
+    unittest.main()
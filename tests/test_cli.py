@@ -0,0 +1,35 @@
+import os
+import subprocess
+import tempfile
+import unittest
+
+from agent.cli import _porcelain_z_lines
+
+
+def git(repo: str, *args: str) -> bytes:
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True).stdout
+
+
+class GitStatusTests(unittest.TestCase):
+    def test_staged_rename_is_one_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            git(tmp, "init", "-q")
+            for name in ("old.txt", "kept.txt"):
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write(f"{name}\n")
+            git(tmp, "add", ".")
+            git(tmp, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "init")
+            git(tmp, "mv", "old.txt", "new.txt")
+            with open(os.path.join(tmp, "kept.txt"), "a") as f:
+                f.write("changed\n")
+
+            lines = _porcelain_z_lines(git(tmp, "status", "--porcelain", "-z"))
+            self.assertEqual(lines, [b" M kept.txt", b"R  old.txt -> new.txt"])
+            self.assertEqual(lines, git(tmp, "status", "--porcelain").splitlines())
+
+    def test_clean_status_has_no_entries(self):
+        self.assertEqual(_porcelain_z_lines(b""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
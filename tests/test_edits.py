@@ -1,5 +1,6 @@
 import os
 import tempfile
+import time
 import unittest
 
 from agent.edits import (
@@ -24,6 +25,35 @@ class EditProtocolTests(unittest.TestCase):
         self.assertTrue(sanitized)
         self.assertEqual(edits[0]["op"], "append_text")
 
+    def test_parse_results_are_independent_copies(self):
+        response = '{"edits":[{"op":"replace_snippet","old":"abc","new":"xyz"}]}'
+        edits, _ = parse_edit_instructions(response)
+        edits[0]["new"] = "changed"
+        edits.append({"op": "delete_file"})
+
+        edits, _ = parse_edit_instructions(response)
+        self.assertEqual(edits, [{"op": "replace_snippet", "old": "abc", "new": "xyz"}])
+
+    def test_parse_rejects_unsupported_op(self):
+        with self.assertRaisesRegex(ValueError, "Edit #2: unsupported operation 'rewrite'"):
+            parse_edit_instructions(
+                '{"edits":[{"op":"append_text","text":"x"},{"op":"rewrite"}]}'
+            )
+
+    def test_parse_reports_decode_error_for_malformed_outer_payload(self):
+        with self.assertRaisesRegex(ValueError, "Invalid JSON edit instructions: Expecting ',' delimiter"):
+            parse_edit_instructions(
+                '{"edits":[{"op":"replace_snippet","old":"a","new":"b"},'
+                '{"op":"insert_after","anchor":"x","text":"say "hi""}]}'
+            )
+
+    def test_parse_truncated_payload_with_many_braces_is_linear(self):
+        response = '{"edits":[{"op":"create_file","path":"a.c","content":"' + "struct s { int a; };\\n" * 4000
+        started = time.perf_counter()
+        with self.assertRaisesRegex(ValueError, "Response is not valid JSON edit instructions"):
+            parse_edit_instructions(response)
+        self.assertLess(time.perf_counter() - started, 1.0)
+
     def test_replace_snippet_unique(self):
         source = "line1\nline2\n"
         result = apply_edit_instructions(
@@ -45,6 +75,21 @@ class EditProtocolTests(unittest.TestCase):
         )
         self.assertEqual(result, "x\ny\n")
 
+    def test_overlapping_matches_count_as_ambiguous(self):
+        with self.assertRaisesRegex(ValueError, "matched 2 locations"):
+            apply_edit_instructions("aaa", [{"op": "replace_snippet", "old": "aa", "new": "b"}])
+        result = apply_edit_instructions(
+            "aaa", [{"op": "replace_snippet", "old": "aa", "new": "b", "occurrence": 2}]
+        )
+        self.assertEqual(result, "ab")
+
+    def test_replace_snippet_occurrence_out_of_range(self):
+        source = "x\nx\n"
+        with self.assertRaisesRegex(ValueError, "occurrence 3 out of range .*found 2 matches"):
+            apply_edit_instructions(
+                source, [{"op": "replace_snippet", "old": "x", "new": "y", "occurrence": 3}]
+            )
+
     def test_insert_after(self):
         source = "a\nb\n"
         result = apply_edit_instructions(
@@ -52,6 +97,43 @@ class EditProtocolTests(unittest.TestCase):
         )
         self.assertEqual(result, "a\nx\nb\n")
 
+    def test_buffered_append_prepend_preserve_order(self):
+        source = "mid\n"
+        result = apply_edit_instructions(
+            source,
+            [
+                {"op": "append_text", "text": "a1\n"},
+                {"op": "prepend_text", "text": "p1\n"},
+                {"op": "prepend_text", "text": "p2\n"},
+                {"op": "replace_snippet", "old": "a1", "new": "A1"},
+                {"op": "append_text", "text": "a2\n"},
+            ],
+        )
+        self.assertEqual(result, "p2\np1\nmid\nA1\na2\n")
+
+    def test_snippet_edits_see_earlier_edits(self):
+        source = "mov r0, #1\nmov r1, #2\nbx lr\n"
+        disjoint = [
+            {"op": "replace_snippet", "old": "#1", "new": "#3"},
+            {"op": "insert_before", "anchor": "bx lr", "text": "nop\n"},
+        ]
+        self.assertEqual(apply_edit_instructions(source, disjoint), "mov r0, #3\nmov r1, #2\nnop\nbx lr\n")
+
+        chained = [
+            {"op": "replace_snippet", "old": "#1", "new": "#7"},
+            {"op": "insert_after", "anchor": "#7\n", "text": "nop\n"},
+        ]
+        self.assertEqual(apply_edit_instructions(source, chained), "mov r0, #7\nnop\nmov r1, #2\nbx lr\n")
+
+        with self.assertRaisesRegex(ValueError, "Edit #2: 'old' snippet matched 2 locations"):
+            apply_edit_instructions(
+                source,
+                [
+                    {"op": "replace_snippet", "old": "#1", "new": "#2"},
+                    {"op": "replace_snippet", "old": "#2", "new": "#5"},
+                ],
+            )
+
     def test_replace_entire_file(self):
         source = "old"
         result = apply_edit_instructions(
@@ -65,13 +147,16 @@ class EditProtocolTests(unittest.TestCase):
             with open(source_file, "w") as f:
                 f.write("A\nB\n")
 
+            file_contents: dict[str, str] = {}
             changed = apply_workspace_edit_instructions(
                 tmp,
                 [{"op": "replace_snippet", "old": "B", "new": "C"}],
                 default_path="agent_code.s",
+                file_contents=file_contents,
             )
 
             self.assertEqual(changed, ["agent_code.s"])
+            self.assertEqual(file_contents, {"agent_code.s": "A\nC\n"})
             with open(source_file, "r") as f:
                 self.assertEqual(f.read(), "A\nC\n")
 
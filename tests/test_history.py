@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+import unittest
+
+from agent.history import RunHistory
+
+
+class RunHistoryTests(unittest.TestCase):
+    def test_incremental_flush_matches_full_dump(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history_file = os.path.join(tmp, "run_history.json")
+            history = RunHistory(history_file)
+
+            history.flush()
+            with open(history_file, "r") as f:
+                self.assertEqual(f.read(), "[]")
+
+            for attempt in range(1, 4):
+                entry = history.append({"attempt": attempt, "diff": ["-a", "+b\n"], "compile_success": None})
+                history.flush()
+                entry["compile_success"] = attempt == 3
+                entry["run_output"] = RunHistory.lines("line1\nline2")
+                history.flush()
+
+                with open(history_file, "r") as f:
+                    self.assertEqual(json.load(f), history.entries)
+
+    def test_last_entry_mutation_shrinking_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history_file = os.path.join(tmp, "run_history.json")
+            history = RunHistory(history_file)
+            history.append({"attempt": 1})
+            entry = history.append({"attempt": 2, "prompt": "x" * 200})
+            history.flush()
+            entry["prompt"] = "short"
+            history.flush()
+
+            with open(history_file, "r") as f:
+                self.assertEqual(json.load(f), [{"attempt": 1}, {"attempt": 2, "prompt": "short"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
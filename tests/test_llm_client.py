@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agent import llm_client
+
+
+class LlmResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        llm_client._served_cache_keys.clear()
+
+    def test_cached_response_is_reused_once_per_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = os.path.join(tmp, "llm_cache.json")
+            key = llm_client._llm_cache_key("contract", "prompt")
+            llm_client._store_llm_cache(cache_file, key, "mov r0, #1\n")
+
+            with mock.patch.object(llm_client.subprocess, "Popen") as popen:
+                response = llm_client.call_llm(
+                    "prompt", writable_dir=tmp, log_dir=tmp, task_contract_prompt="contract", cache_file=cache_file
+                )
+                popen.assert_not_called()
+            self.assertEqual(response, "mov r0, #1\n")
+
+            with mock.patch.object(llm_client.subprocess, "Popen", side_effect=OSError("no gemini")) as popen:
+                response = llm_client.call_llm(
+                    "prompt", writable_dir=tmp, log_dir=tmp, task_contract_prompt="contract", cache_file=cache_file
+                )
+                popen.assert_called_once()
+            self.assertEqual(response, llm_client.FALLBACK_SOURCE)
+
+    def test_unstored_response_is_not_served_on_the_next_run(self):
+        real_popen = llm_client.subprocess.Popen
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = os.path.join(tmp, "llm_cache.json")
+            with mock.patch.object(
+                llm_client.subprocess, "Popen", side_effect=lambda cmd, **kw: real_popen(["printf", "failed"], **kw)
+            ):
+                response = llm_client.call_llm("prompt", writable_dir=tmp, log_dir=tmp, cache_file=cache_file)
+            self.assertEqual(response, "failed")
+            self.assertFalse(os.path.exists(cache_file))
+
+            # A new run: only a response stored after a successful attempt is served.
+            llm_client._served_cache_keys.clear()
+            llm_client.store_llm_response(cache_file, "prompt", "worked")
+            with mock.patch.object(llm_client.subprocess, "Popen") as popen:
+                response = llm_client.call_llm("prompt", writable_dir=tmp, log_dir=tmp, cache_file=cache_file)
+                popen.assert_not_called()
+            self.assertEqual(response, "worked")
+            self.assertFalse([name for name in os.listdir(tmp) if name.endswith(".tmp")])
+
+    def test_long_prompt_is_written_to_stdin_in_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            gemini = os.path.join(tmp, "gemini")
+            with open(gemini, "w") as f:
+                f.write("#!/bin/sh\nwc -c\n")
+            os.chmod(gemini, 0o755)
+            prompt = "x" * 300_000
+            with mock.patch.dict(os.environ, {"PATH": tmp + os.pathsep + os.environ.get("PATH", "")}):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    response = llm_client.call_llm(prompt, writable_dir=tmp, log_dir=tmp)
+            with open(os.path.join(tmp, "current_prompt.txt"), "rb") as f:
+                self.assertEqual(int(response), len(f.read()))
+
+    def test_expired_entries_are_not_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = os.path.join(tmp, "llm_cache.json")
+            key = llm_client._llm_cache_key("", "prompt")
+            llm_client._store_llm_cache(cache_file, key, "stale")
+
+            later = llm_client.time.time() + llm_client.LLM_CACHE_TTL_SEC
+            with mock.patch.object(llm_client.time, "time", return_value=later):
+                with mock.patch.object(llm_client.subprocess, "Popen", side_effect=OSError("no gemini")) as popen:
+                    llm_client.call_llm("prompt", writable_dir=tmp, log_dir=tmp, cache_file=cache_file)
+                    popen.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
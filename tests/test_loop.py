@@ -0,0 +1,108 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agent import loop
+from agent.llm_client import _llm_cache_key
+from agent.models import LoopConfig
+
+SOURCE = "    .global _start\n_start:\n    mov r0, #1\n"
+
+
+def make_config(tmp: str, **overrides) -> LoopConfig:
+    values = dict(
+        toolchain="gcc",
+        incremental=False,
+        incremental_strict=False,
+        repo_mode=False,
+        repo_dir=None,
+        entry_file_rel="agent_code.s",
+        build_cmd=None,
+        test_cmd=None,
+        verify_timeout_sec=1,
+        expected_output="DONE",
+        board_name="board",
+        edit_dir=tmp,
+        run_dir=tmp,
+        code_dir=tmp,
+        source_file=os.path.join(tmp, "agent_code.s"),
+        elf_file=os.path.join(tmp, "agent_code.elf"),
+        history_file=os.path.join(tmp, "run_history.json"),
+        initial_prompt="Print DONE.",
+        task_contract_prompt="contract",
+        workspace=tmp,
+        toolchain_binaries=None,
+        max_retries=2,
+        llm_cache_file=os.path.join(tmp, "llm_cache.json"),
+    )
+    values.update(overrides)
+    return LoopConfig(**values)
+
+
+def run_loop(
+    config: LoopConfig,
+    responses: list[str],
+    run_results: list[tuple[bool, str, bool]],
+    compile_code=None,
+):
+    with mock.patch.object(loop, "call_llm", side_effect=responses) as call_llm, \
+            mock.patch.object(loop, "compile_code", side_effect=compile_code, return_value=(True, "")), \
+            mock.patch.object(loop, "run_in_simulator", side_effect=run_results), \
+            mock.patch.object(loop, "snapshot_successful_run", return_value=config.code_dir), \
+            contextlib.redirect_stdout(io.StringIO()):
+        loop.run_agent_loop(config)
+    return call_llm
+
+
+class AgentLoopTests(unittest.TestCase):
+    def test_failed_attempts_are_not_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = make_config(tmp)
+            run_loop(config, [SOURCE, SOURCE], [(True, "nope", False)])
+            self.assertFalse(os.path.exists(config.llm_cache_file))
+
+    def test_successful_attempt_is_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = make_config(tmp, max_retries=1)
+            call_llm = run_loop(config, [SOURCE], [(True, "DONE", False)])
+            with open(config.llm_cache_file, "r") as f:
+                cache = json.load(f)
+            key = _llm_cache_key(config.task_contract_prompt, call_llm.call_args.args[0])
+            self.assertEqual(cache[key]["response"], SOURCE)
+
+    def test_source_is_rewritten_after_failed_edits_delete_it(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = make_config(tmp, incremental=True, max_retries=4, llm_cache_file=None)
+            with open(config.source_file, "w") as f:
+                f.write(SOURCE)
+            with open(os.path.join(tmp, "helper.inc"), "w") as f:
+                f.write("@ helper\n")
+            edited_source = SOURCE.replace("#1", "#2")
+            responses = [
+                json.dumps({"edits": [{"op": "replace_snippet", "old": "#1", "new": "#2"}]}),
+                json.dumps({"edits": [{"op": "delete_file", "path": "agent_code.s"}]}),
+                # A snippet mismatch switches the next retry to full-source mode.
+                json.dumps({"edits": [{"op": "replace_snippet", "path": "helper.inc", "old": "missing", "new": "x"}]}),
+                edited_source,
+            ]
+            source_on_disk = []
+
+            def compile_code(*args, **kwargs):
+                with open(config.source_file, "r") as f:
+                    source_on_disk.append(f.read())
+                return True, ""
+
+            run_loop(config, responses, [(False, "", True), (True, "DONE", False)], compile_code=compile_code)
+
+            self.assertEqual(source_on_disk, [edited_source, edited_source])
+            with open(config.history_file, "r") as f:
+                results = [entry["attempt_result"] for entry in json.load(f)]
+            self.assertEqual(results, ["run_timed_out", "edit_apply_failed", "edit_apply_failed", "success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
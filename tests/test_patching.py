@@ -0,0 +1,28 @@
+import unittest
+
+from agent.patching import apply_unified_diff_patch
+
+
+class UnifiedDiffPatchTests(unittest.TestCase):
+    def test_apply_exact_hunk(self):
+        original = "a\nb\nc\n"
+        patch = "--- a\n+++ b\n@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n"
+        self.assertEqual(apply_unified_diff_patch(original, patch), "a\nB\nc\n")
+
+    def test_fuzzy_aligns_shifted_hunk(self):
+        original = "x\ny\na\nb\nc\n"
+        patch = "@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n"
+        self.assertEqual(apply_unified_diff_patch(original, patch), "x\ny\na\nB\nc\n")
+
+    def test_pure_insert_and_context_only_hunks(self):
+        original = "a\nb\nc\n"
+        patch = "@@ -1,0 +1,1 @@\n+top\n@@ -2,1 +3,1 @@\n b\n"
+        self.assertEqual(apply_unified_diff_patch(original, patch), "top\na\nb\nc\n")
+
+    def test_context_mismatch_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Patch context does not match current source"):
+            apply_unified_diff_patch("a\nb\n", "@@ -1,2 +1,2 @@\n a\n-z\n+Z\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
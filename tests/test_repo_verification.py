@@ -34,6 +34,32 @@ class RepoVerificationTests(unittest.TestCase):
             self.assertEqual(result.stage, "test")
             self.assertFalse(result.timed_out)
 
+    def test_parallel_stages_report_build_failure_first(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_repo_verification(
+                repo_dir=tmp,
+                build_cmd="sleep 0.2; false",
+                test_cmd="printf test-ok",
+                timeout_sec=5,
+                parallel=True,
+            )
+            self.assertFalse(result.success)
+            self.assertEqual(result.stage, "build")
+
+    def test_parallel_stages_success_combines_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_repo_verification(
+                repo_dir=tmp,
+                build_cmd="printf build-ok",
+                test_cmd="printf test-ok",
+                timeout_sec=5,
+                parallel=True,
+            )
+            self.assertTrue(result.success)
+            self.assertEqual(result.stage, "test")
+            self.assertIn("build-ok", result.output)
+            self.assertIn("test-ok", result.output)
+
 
 if __name__ == "__main__":
     unittest.main()
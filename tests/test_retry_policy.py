@@ -1,5 +1,6 @@
 import unittest
 
+from agent.prompting import clip_tool_output
 from agent.retry_policy import decide_next_retry
 
 
@@ -63,6 +64,40 @@ class RetryPolicyTests(unittest.TestCase):
         self.assertEqual(decision.next_mode, "full_source")
         self.assertIn("failed to compile", decision.next_prompt)
 
+    def test_long_compile_error_is_clipped_keeping_head_and_tail(self):
+        compile_error = "\n".join(f"line {i}" for i in range(1000))
+        decision = decide_next_retry(
+            outcome="compile_failed",
+            compile_error=compile_error,
+            **self._kwargs(),
+        )
+        self.assertIn("line 0\n", decision.next_prompt)
+        self.assertIn("line 999", decision.next_prompt)
+        self.assertIn("[output truncated]", decision.next_prompt)
+        self.assertNotIn("line 500\n", decision.next_prompt)
+
+    def test_run_timeout_reports_the_single_run_limit(self):
+        decision = decide_next_retry(
+            outcome="run_timed_out",
+            run_output="partial",
+            run_timeout_sec=8,
+            **self._kwargs(),
+        )
+        self.assertIn("timed out after 8 seconds (it was run once with that limit)", decision.next_prompt)
+        self.assertNotIn("multiple attempts", decision.next_prompt)
+
+    def test_clip_keeps_output_at_the_line_limit(self):
+        output = "".join(f"error {i:03}\n" for i in range(80))
+        self.assertEqual(clip_tool_output(output), output)
+
+    def test_clip_single_long_line_keeps_both_ends(self):
+        output = "H" * 100 + "x" * 4900 + "T" * 100
+        clipped = clip_tool_output(output)
+        self.assertTrue(clipped.startswith("H" * 100))
+        self.assertTrue(clipped.endswith("T" * 100))
+        self.assertIn("[output truncated]", clipped)
+        self.assertLess(len(clipped), len(output))
+
     def test_verification_failed_non_incremental_uses_full_source(self):
         decision = decide_next_retry(
             outcome="verification_failed",
@@ -0,0 +1,61 @@
+import os
+import stat
+import tempfile
+import unittest
+
+from agent import workspace
+from agent.workspace import write_text_atomic
+
+
+class WriteTextAtomicTests(unittest.TestCase):
+    def test_replaces_content_and_keeps_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "build.sh")
+            with open(path, "w") as f:
+                f.write("old\n")
+            os.chmod(path, 0o755)
+
+            write_text_atomic(path, "new\n")
+
+            with open(path, "r") as f:
+                self.assertEqual(f.read(), "new\n")
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o755)
+            self.assertEqual(os.listdir(tmp), ["build.sh"])
+
+    def test_creates_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "agent_code.s")
+            write_text_atomic(path, "mov r0, #1\n")
+            with open(path, "r") as f:
+                self.assertEqual(f.read(), "mov r0, #1\n")
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o666 & ~workspace._UMASK)
+
+    def test_keeps_existing_tmp_file_and_symlink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "real.s")
+            link = os.path.join(tmp, "agent_code.s")
+            with open(target, "w") as f:
+                f.write("old\n")
+            os.symlink(target, link)
+            with open(link + ".tmp", "w") as f:
+                f.write("user file\n")
+
+            write_text_atomic(link, "new\n")
+
+            self.assertTrue(os.path.islink(link))
+            with open(target, "r") as f:
+                self.assertEqual(f.read(), "new\n")
+            with open(link + ".tmp", "r") as f:
+                self.assertEqual(f.read(), "user file\n")
+            self.assertEqual(sorted(os.listdir(tmp)), ["agent_code.s", "agent_code.s.tmp", "real.s"])
+
+    def test_failed_write_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "agent_code.s")
+            with self.assertRaises(UnicodeEncodeError):
+                write_text_atomic(path, "\udc80")
+            self.assertEqual(os.listdir(tmp), [])
+
+
+if __name__ == "__main__":
+    unittest.main()